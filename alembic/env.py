@@ -13,6 +13,7 @@ from alembic import context
 
 # Import the SQLAlchemy models
 from app.db.session import Base
+from app.models.refresh_token import RefreshToken  # noqa
 from app.models.user import User  # noqa
 
 # this is the Alembic Config object, which provides
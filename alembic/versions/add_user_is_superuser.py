@@ -0,0 +1,28 @@
+"""Add is_superuser to users
+
+Revision ID: add_user_is_superuser
+Revises: initial_migration
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_is_superuser'
+down_revision = 'initial_migration'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'users',
+        sa.Column('is_superuser', sa.Boolean(), server_default=sa.false(), nullable=False)
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('is_superuser')
@@ -0,0 +1,27 @@
+"""Add composite indexes for user listing
+
+Revision ID: add_user_list_indexes
+Revises: add_user_is_superuser
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_list_indexes'
+down_revision = 'add_user_is_superuser'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination seeks on (sort column, id)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('ix_users_last_name_id', 'users', ['last_name', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_users_last_name_id', table_name='users')
+    op.drop_index('ix_users_created_at_id', table_name='users')
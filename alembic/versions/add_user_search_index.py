@@ -0,0 +1,73 @@
+"""Add full-text search index over user names and emails
+
+Revision ID: add_user_search_index
+Revises: add_user_list_indexes
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_search_index'
+down_revision = 'add_user_list_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite only
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    
+    # External content table: the index only, text is read from users
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE users_fts USING fts5(
+            email, first_name, last_name,
+            content='users', content_rowid='id', prefix='2 3'
+        )
+        """
+    )
+    
+    # Keep the index in step with users
+    op.execute(
+        """
+        CREATE TRIGGER users_fts_ai AFTER INSERT ON users BEGIN
+            INSERT INTO users_fts(rowid, email, first_name, last_name)
+            VALUES (new.id, new.email, new.first_name, new.last_name);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_fts_ad AFTER DELETE ON users BEGIN
+            INSERT INTO users_fts(users_fts, rowid, email, first_name, last_name)
+            VALUES ('delete', old.id, old.email, old.first_name, old.last_name);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_fts_au AFTER UPDATE OF email, first_name, last_name ON users BEGIN
+            INSERT INTO users_fts(users_fts, rowid, email, first_name, last_name)
+            VALUES ('delete', old.id, old.email, old.first_name, old.last_name);
+            INSERT INTO users_fts(rowid, email, first_name, last_name)
+            VALUES (new.id, new.email, new.first_name, new.last_name);
+        END
+        """
+    )
+    
+    # Index the existing rows
+    op.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    
+    op.execute("DROP TRIGGER IF EXISTS users_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS users_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS users_fts_ai")
+    op.execute("DROP TABLE IF EXISTS users_fts")
@@ -0,0 +1,38 @@
+"""Store user updated_at with microseconds
+
+Revision ID: normalize_user_updated_at
+Revises: add_refresh_tokens
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'normalize_user_updated_at'
+down_revision = 'add_refresh_tokens'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Other databases store timestamps natively
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    
+    # updated_at used to be set by CURRENT_TIMESTAMP ("YYYY-MM-DD HH:MM:SS").
+    # It is now set by the application, which SQLAlchemy stores with
+    # microseconds; rewrite old values in that format so conditional
+    # updates (If-Match on PUT /users/me) compare equal.
+    op.execute(
+        """
+        UPDATE users SET updated_at = updated_at || '.000000'
+        WHERE length(updated_at) = 19
+        """
+    )
+
+
+def downgrade():
+    # The old format is a prefix of the new one; nothing to undo
+    pass
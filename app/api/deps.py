@@ -4,51 +4,61 @@ API dependencies module.
 This module provides dependency functions for the API routes.
 """
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt
+import hmac
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Security, status
+from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
 from jose.exceptions import JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
 
+from app.core.cache import user_cache
 from app.core.config import settings
-from app.db.session import get_db
-from app.models.user import User
-from app.schemas.token import TokenPayload
+from app.core.security import decode_access_token
+from app.crud import user as crud_user
+from app.db.replicas import get_read_db
+from app.db.session import DbSession
+from app.schemas.user import UserSnapshot
 
 security = HTTPBearer()
+service_key_header = APIKeyHeader(name="X-Service-Key", auto_error=False)
 
 
-def get_current_user(
-    db: Session = Depends(get_db), 
+async def get_current_user(
+    db: DbSession = Depends(get_read_db),
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
+) -> UserSnapshot:
     """
     Get the current user from the token.
     
+    Active users are served from the in-process user cache when possible,
+    so most authenticated requests don't query the database.
+    
     Args:
         db: Database session
         token: JWT token
         
     Returns:
-        User: Current user
+        UserSnapshot: Current user
         
     Raises:
         HTTPException: If token is invalid or user not found
     """
     try:
         token = credentials.credentials
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=["HS256"]
-        )
-        token_data = TokenPayload(**payload)
-    except (JWTError, ValidationError):
+        token_data = decode_access_token(token)
+        user_id = int(token_data.sub)
+    except (JWTError, ValidationError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
     
-    user = db.query(User).filter(User.id == token_data.sub).first()
+    cached_user = user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+    
+    user = await crud_user.get(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -61,4 +71,53 @@ def get_current_user(
             detail="Inactive user",
         )
     
-    return user
+    snapshot = UserSnapshot.model_validate(user)
+    user_cache.set(user_id, snapshot)
+    return snapshot
+
+
+async def get_current_active_superuser(
+    current_user: UserSnapshot = Depends(get_current_user),
+) -> UserSnapshot:
+    """
+    Get the current user and require admin privileges.
+    
+    Args:
+        current_user: Current authenticated user
+    
+    Returns:
+        UserSnapshot: Current user
+    
+    Raises:
+        HTTPException: If the user is not a superuser
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="The user doesn't have enough privileges",
+        )
+    return current_user
+
+
+async def require_service_key(
+    service_key: Optional[str] = Security(service_key_header),
+) -> None:
+    """
+    Require a valid internal service key in the X-Service-Key header.
+    
+    Args:
+        service_key: The key sent by the caller
+    
+    Raises:
+        HTTPException: If the key is missing or not one of SERVICE_API_KEYS
+    """
+    # Check every key, so the time taken does not reveal which one nearly matched
+    valid = False
+    if service_key:
+        for key in settings.SERVICE_API_KEYS:
+            valid |= hmac.compare_digest(service_key.encode(), key.encode())
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid service key",
+        )
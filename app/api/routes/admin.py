@@ -0,0 +1,433 @@
+"""
+Admin routes module.
+
+This module defines the API routes for administrative operations on users.
+All routes require a superuser.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from app.api.deps import get_current_active_superuser
+from app.core.config import settings
+from app.core.security import get_password_hashes_async
+from app.crud import user as crud_user
+from app.db.replicas import get_read_db, get_write_db
+from app.db.session import DbSession
+from app.schemas.user import UserCreate
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+# Import bodies larger than this are spooled to disk
+SPOOL_MEMORY_BYTES = 1024 * 1024
+
+IMPORT_FORMATS = {
+    NDJSON_MEDIA_TYPE: "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    CSV_MEDIA_TYPE: "csv",
+}
+
+
+class ImportRowError(ValueError):
+    """
+    Raised for an import row that cannot be parsed.
+    """
+
+
+async def _spool_body(request: Request) -> BinaryIO:
+    """
+    Copy a request body into a temporary file as it streams in.
+    
+    The body must be fully received before the streaming report starts,
+    because the response listens for client disconnects on the same channel.
+    Small bodies stay in memory; larger ones go to disk.
+    
+    Args:
+        request: The incoming request
+    
+    Returns:
+        BinaryIO: The spooled body, positioned at the start
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def _iter_import_rows(body: BinaryIO, import_format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Parse NDJSON or CSV import rows from a spooled request body.
+    
+    CSV input needs a header row; quoted fields may contain newlines.
+    Blank lines are skipped.
+    
+    Args:
+        body: The spooled request body
+        import_format: "ndjson" or "csv"
+    
+    Yields:
+        Tuple[int, Any]: Line number and the row as a dict, or an ImportRowError
+    
+    Raises:
+        ImportRowError: If a line is longer than BULK_IMPORT_MAX_LINE_BYTES
+    """
+    text = io.TextIOWrapper(body, encoding="utf-8", newline="")
+    max_line = settings.BULK_IMPORT_MAX_LINE_BYTES
+    
+    if import_format == "csv":
+        csv.field_size_limit(max_line)
+        reader = csv.reader(text)
+        header: Optional[List[str]] = None
+        while True:
+            try:
+                values = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                raise ImportRowError(f"Invalid CSV: {e}; import stopped")
+            if not values or not any(value.strip() for value in values):
+                continue
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) != len(header):
+                yield reader.line_num, ImportRowError(
+                    f"Expected {len(header)} columns, got {len(values)}"
+                )
+                continue
+            yield reader.line_num, dict(zip(header, values))
+    
+    line_number = 0
+    while True:
+        line = text.readline(max_line + 1)
+        if not line:
+            return
+        line_number += 1
+        if len(line) > max_line:
+            raise ImportRowError("Line too long; import stopped")
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, ImportRowError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(row, dict):
+            yield line_number, ImportRowError("Row must be a JSON object")
+            continue
+        yield line_number, row
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """
+    Format a validation error as one line.
+    
+    Args:
+        error: The validation error
+    
+    Returns:
+        str: Field locations and messages
+    """
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def _ndjson(data: Dict[str, Any]) -> bytes:
+    """
+    Encode one NDJSON line.
+    
+    Args:
+        data: The object to encode
+    
+    Returns:
+        bytes: JSON followed by a newline
+    """
+    return json.dumps(data).encode() + b"\n"
+
+
+async def _import_batch(
+    db: DbSession, batch: List[Tuple[int, UserCreate]], counts: Dict[str, int]
+) -> AsyncIterator[bytes]:
+    """
+    Hash and insert one batch of validated rows.
+    
+    Args:
+        db: Database session
+        batch: Line numbers paired with validated rows
+        counts: Running totals, updated in place
+    
+    Yields:
+        bytes: An NDJSON error line for each row that was not created
+    """
+    # Drop emails repeated within the batch or already registered
+    existing = await crud_user.get_existing_emails(db, {user_in.email for _, user_in in batch})
+    accepted: List[Tuple[int, UserCreate]] = []
+    for line_number, user_in in batch:
+        if user_in.email in existing:
+            counts["failed"] += 1
+            yield _ndjson(
+                {"row": line_number, "email": user_in.email, "error": "Email already registered"}
+            )
+            continue
+        existing.add(user_in.email)
+        accepted.append((line_number, user_in))
+    
+    hashed_passwords = await get_password_hashes_async(
+        [user_in.password for _, user_in in accepted]
+    )
+    users = [(user_in, hashed) for (_, user_in), hashed in zip(accepted, hashed_passwords)]
+    
+    try:
+        counts["created"] += await crud_user.create_many(db, users)
+        return
+    except IntegrityError:
+        pass
+    
+    # An email was registered concurrently; insert rows one by one to isolate it
+    for (line_number, user_in), user in zip(accepted, users):
+        try:
+            counts["created"] += await crud_user.create_many(db, [user])
+        except IntegrityError:
+            counts["failed"] += 1
+            yield _ndjson(
+                {"row": line_number, "email": user_in.email, "error": "Email already registered"}
+            )
+
+
+async def _import_users(
+    body: BinaryIO, import_format: str, db: DbSession
+) -> AsyncIterator[bytes]:
+    """
+    Import users from a spooled request body, reporting as it goes.
+    
+    Args:
+        body: The spooled request body; closed when the import ends
+        import_format: "ndjson" or "csv"
+        db: Database session
+    
+    Yields:
+        bytes: NDJSON lines with per-row errors, progress after each batch and a final summary
+    """
+    counts = {"rows": 0, "created": 0, "failed": 0}
+    batch: List[Tuple[int, UserCreate]] = []
+    
+    try:
+        for line_number, row in _iter_import_rows(body, import_format):
+            counts["rows"] += 1
+            try:
+                if isinstance(row, ImportRowError):
+                    raise row
+                batch.append((line_number, UserCreate.model_validate(row)))
+            except ImportRowError as e:
+                counts["failed"] += 1
+                yield _ndjson({"row": line_number, "error": str(e)})
+            except ValidationError as e:
+                counts["failed"] += 1
+                yield _ndjson({"row": line_number, "error": _format_validation_error(e)})
+            
+            if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+                async for line in _import_batch(db, batch, counts):
+                    yield line
+                batch = []
+                yield _ndjson({"progress": dict(counts)})
+    except ImportRowError as e:
+        yield _ndjson({"error": str(e)})
+    except UnicodeDecodeError:
+        yield _ndjson({"error": "Body is not valid UTF-8; import stopped"})
+    finally:
+        body.close()
+    
+    if batch:
+        async for line in _import_batch(db, batch, counts):
+            yield line
+    yield _ndjson({"summary": counts})
+
+
+@router.post("/users/import")
+async def import_users(
+    request: Request,
+    format: Optional[str] = Query(
+        None, pattern="^(ndjson|csv)$", description="Input format; defaults to the Content-Type"
+    ),
+    db: DbSession = Depends(get_write_db),
+) -> StreamingResponse:
+    """
+    Bulk import users from an NDJSON or CSV request body.
+    
+    The body is spooled to a temporary file as it arrives, then rows are
+    validated against UserCreate, hashed in parallel and inserted in batches
+    of BULK_IMPORT_BATCH_SIZE, so memory use does not depend on the file
+    size. The response is NDJSON: one line per failed row, a progress line
+    after each batch and a final summary.
+    
+    Args:
+        request: The incoming request
+        format: Input format ("ndjson" or "csv")
+        db: Database session
+    
+    Returns:
+        StreamingResponse: NDJSON import report
+    
+    Raises:
+        HTTPException: If the format cannot be determined
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    import_format = format or IMPORT_FORMATS.get(content_type)
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send NDJSON or CSV, or pass ?format=ndjson|csv",
+        )
+    
+    body = await _spool_body(request)
+    return StreamingResponse(
+        _import_users(body, import_format, db), media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+def _to_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert a datetime to naive UTC, as SQLite stores created_at.
+    
+    Args:
+        value: The datetime, possibly timezone-aware
+    
+    Returns:
+        Optional[datetime]: The naive UTC datetime, or None
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _json_default(value: Any) -> str:
+    """
+    Serialize values the json module does not handle.
+    
+    Args:
+        value: The value to serialize
+    
+    Returns:
+        str: ISO 8601 text for datetimes
+    
+    Raises:
+        TypeError: For any other unsupported type
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    """
+    Format a column value for a CSV cell.
+    
+    Args:
+        value: The column value
+    
+    Returns:
+        Any: An empty string for None, ISO 8601 text for datetimes, else the value
+    """
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def _export_users(
+    db: DbSession, export_format: str, filters: Dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """
+    Stream users page by page using keyset pagination over User.id.
+    
+    Only one page of EXPORT_PAGE_SIZE rows is held in memory at a time.
+    
+    Args:
+        db: Database session
+        export_format: "ndjson" or "csv"
+        filters: Keyword filters for crud_user.get_public_page
+    
+    Yields:
+        bytes: Encoded rows
+    """
+    columns = [column.key for column in crud_user.PUBLIC_COLUMNS]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(columns)
+    
+    after_id = 0
+    while True:
+        rows = await crud_user.get_public_page(
+            db, after_id=after_id, limit=settings.EXPORT_PAGE_SIZE, **filters
+        )
+        if not rows:
+            return
+        
+        if export_format == "csv":
+            for row in rows:
+                writer.writerow([_csv_value(row[name]) for name in columns])
+        else:
+            for row in rows:
+                buffer.write(json.dumps(row, default=_json_default))
+                buffer.write("\n")
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        
+        after_id = rows[-1]["id"]
+        if len(rows) < settings.EXPORT_PAGE_SIZE:
+            return
+
+
+@router.get("/users/export")
+async def export_users(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Output format"),
+    is_active: Optional[bool] = Query(None, description="Only users with this active flag"),
+    created_from: Optional[datetime] = Query(None, description="Only users created at or after"),
+    created_to: Optional[datetime] = Query(None, description="Only users created before"),
+    db: DbSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """
+    Export users as NDJSON or CSV.
+    
+    Rows are streamed in id order, fetched with keyset pagination, so memory
+    stays flat at any table size. Password hashes are never included.
+    
+    Args:
+        format: Output format ("ndjson" or "csv")
+        is_active: Only users with this active flag, if given
+        created_from: Only users created at or after this time, if given
+        created_to: Only users created before this time, if given
+        db: Database session
+    
+    Returns:
+        StreamingResponse: The exported users
+    """
+    filters = {
+        "is_active": is_active,
+        "created_from": _to_utc_naive(created_from),
+        "created_to": _to_utc_naive(created_to),
+    }
+    media_type = CSV_MEDIA_TYPE if format == "csv" else NDJSON_MEDIA_TYPE
+    return StreamingResponse(
+        _export_users(db, format, filters),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
@@ -4,14 +4,23 @@ Authentication routes module.
 This module defines the API routes for authentication operations.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from typing import Optional, Tuple
 
-from app.core.rate_limiter import register_rate_limit
-from app.core.security import create_user_token, get_password_hash, verify_password
-from app.db.session import get_db
-from app.models.user import User
-from app.schemas.token import Token, LoginRequest
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+
+from app.core.rate_limiter import login_rate_limit, register_rate_limit
+from app.core.security import (
+    create_user_token,
+    get_password_hash_async,
+    get_token_signer,
+    verify_and_update_password_async,
+)
+from app.core.singleflight import login_flight, login_flight_key
+from app.crud import refresh_token as crud_refresh_token
+from app.crud import user as crud_user
+from app.db.replicas import get_write_db, mark_user_write
+from app.db.session import DbSession
+from app.schemas.token import LoginRequest, RefreshRequest, Token
 from app.schemas.user import UserCreate
 
 router = APIRouter()
@@ -20,7 +29,7 @@ router = APIRouter()
 @router.post("/register", response_model=Token)
 @register_rate_limit()
 async def register(
-    user_in: UserCreate, db: Session = Depends(get_db), request: Request = None
+    user_in: UserCreate, db: DbSession = Depends(get_write_db), request: Request = None
 ) -> Token:
     """
     Register a new user.
@@ -31,13 +40,13 @@ async def register(
         request: Request object for rate limiting
         
     Returns:
-        Token: JWT token for the new user
+        Token: JWT access token and refresh token for the new user
         
     Raises:
         HTTPException: If email already exists
     """
     # Check if user with this email already exists
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = await crud_user.get_by_email(db, user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -45,60 +54,149 @@ async def register(
         )
     
     # Create new user
-    db_user = User(
-        email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
-        first_name=user_in.first_name,
-        last_name=user_in.last_name,
-    )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    hashed_password = await get_password_hash_async(user_in.password)
+    db_user = await crud_user.create(db, user_in, hashed_password)
     
-    # Create access token
+    # Create access and refresh tokens
     access_token = create_user_token(
         user_id=db_user.id, email=db_user.email, last_name=db_user.last_name
     )
+    refresh_token = await crud_refresh_token.issue(db, db_user.id)
+    # The client's next requests carry the new token, so stick by user
+    mark_user_write(db_user.id)
     
-    return Token(access_token=access_token, token_type="bearer")
+    return Token(access_token=access_token, token_type="bearer", refresh_token=refresh_token)
+
+
+async def _authenticate(
+    db: DbSession, email: str, password: str
+) -> Optional[Tuple[int, str, str]]:
+    """
+    Check login credentials.
+    
+    A password hash made with an outdated scheme or cost is replaced.
+    
+    Args:
+        db: Database session
+        email: The submitted email
+        password: The submitted password
+    
+    Returns:
+        Optional[Tuple[int, str, str]]: The user's id, email and last name,
+        or None if the credentials are invalid
+    """
+    # Find user by email
+    user = await crud_user.get_by_email(db, email)
+    if not user:
+        return None
+    
+    # Identical concurrent attempts (client retries) share one verification.
+    # Only the CPU-bound check is shared: the shared task outlives a cancelled
+    # caller, so it must not use that caller's session.
+    hashed_password = user.hashed_password
+    verified, new_hash = await login_flight.do(
+        login_flight_key(hashed_password, password),
+        lambda: verify_and_update_password_async(password, hashed_password),
+    )
+    if not verified:
+        return None
+    
+    # Move hashes made with an old scheme or cost to the current policy
+    if new_hash is not None:
+        await crud_user.set_password_hash(db, user, new_hash)
+    
+    return user.id, user.email, user.last_name
 
 
 @router.post("/login", response_model=Token)
+@login_rate_limit()
 async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: DbSession = Depends(get_write_db),
 ) -> Token:
     """
     Login for access token.
     
+    Repeated failures for an account or client IP are throttled with
+    exponential backoff before the password is checked. Concurrent identical
+    attempts share one password verification, then each gets its own token.
+    
     Args:
         login_data: Login request with username and password
+        request: Request object for login throttling
         db: Database session
         
     Returns:
-        Token: JWT token for the user
+        Token: JWT access token and refresh token for the user
         
     Raises:
         HTTPException: If credentials are invalid
     """
-    # Find user by email
-    user = db.query(User).filter(User.email == login_data.username).first()
-    if not user:
+    identity = await _authenticate(db, login_data.username, login_data.password)
+    if identity is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
     
-    # Verify password
-    if not verify_password(login_data.password, user.hashed_password):
+    # Create access and refresh tokens
+    user_id, email, last_name = identity
+    access_token = create_user_token(user_id=user_id, email=email, last_name=last_name)
+    refresh_token = await crud_refresh_token.issue(db, user_id)
+    mark_user_write(user_id)
+    
+    return Token(access_token=access_token, token_type="bearer", refresh_token=refresh_token)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(
+    refresh_data: RefreshRequest,
+    db: DbSession = Depends(get_write_db),
+) -> Token:
+    """
+    Exchange a refresh token for a new access token and refresh token.
+    
+    Costs one indexed lookup instead of a password verification. The
+    refresh token is rotated: the old one stops working, and reusing it
+    revokes every token descended from the same login.
+    
+    Args:
+        refresh_data: Refresh request with the refresh token
+        db: Database session
+    
+    Returns:
+        Token: New access and refresh tokens
+    
+    Raises:
+        HTTPException: If the refresh token is invalid, expired or reused
+    """
+    rotated = await crud_refresh_token.rotate(db, refresh_data.refresh_token)
+    if rotated is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
+            detail="Invalid refresh token",
         )
     
-    # Create access token
-    access_token = create_user_token(
-        user_id=user.id, email=user.email, last_name=user.last_name
-    )
+    user, refresh_token = rotated
+    mark_user_write(user.id)
+    access_token = create_user_token(user_id=user.id, email=user.email, last_name=user.last_name)
+    return Token(access_token=access_token, token_type="bearer", refresh_token=refresh_token)
+
+
+@router.get("/jwks")
+async def jwks(response: Response) -> dict:
+    """
+    Get the public keys that verify access tokens, as a JSON Web Key Set.
     
-    return Token(access_token=access_token, token_type="bearer")
+    Other services can verify tokens locally with these keys. The set is
+    empty when tokens are signed with the shared HS256 secret.
+    
+    Args:
+        response: Response object for setting cache headers
+    
+    Returns:
+        dict: JSON Web Key Set
+    """
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return get_token_signer().jwks()
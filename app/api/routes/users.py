@@ -4,67 +4,392 @@ User routes module.
 This module defines the API routes for user operations.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+
+from app.api.deps import get_current_active_superuser, get_current_user, require_service_key
+from app.core.cache import user_cache
+from app.core.config import settings
+from app.crud import user as crud_user
+from app.db.replicas import get_read_db, get_write_db
+from app.db.session import DbSession
 from app.models.user import User
-from app.schemas.user import User as UserSchema, UserUpdate
+from app.schemas.user import (
+    User as UserSchema,
+    UserBatch,
+    UserBatchRequest,
+    UserPage,
+    UserSnapshot,
+    UserUpdate,
+)
 
 router = APIRouter()
 
 
-@router.get("/me", response_model=UserSchema)
-async def read_users_me(current_user: User = Depends(get_current_user)) -> UserSchema:
+def _encode_cursor(sort: str, user: User) -> str:
+    """
+    Build the opaque cursor pointing just past a user.
+    
+    Args:
+        sort: The sort key of the listing
+        user: The last user on the page
+    
+    Returns:
+        str: URL-safe cursor
+    """
+    value = getattr(user, sort)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps({"s": sort, "v": value, "id": user.id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """
+    Parse a cursor made by _encode_cursor.
+    
+    Args:
+        cursor: The cursor from the client
+        sort: The sort key of the listing
+    
+    Returns:
+        Tuple[Any, int]: The sort value and id of the last user seen
+    
+    Raises:
+        HTTPException: If the cursor is malformed or was made for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        if data["s"] != sort or not isinstance(data["id"], int):
+            raise ValueError("cursor does not match this listing")
+        value = data["v"]
+        if sort == "created_at" and value is not None:
+            value = datetime.fromisoformat(value)
+        return value, data["id"]
+    except (binascii.Error, UnicodeDecodeError, KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _user_etag(user: Any) -> str:
+    """
+    Get the strong ETag of a user's representation.
+    
+    The tag changes whenever the row is updated, since every update sets
+    updated_at (with microsecond precision).
+    
+    Args:
+        user: A user model instance or snapshot
+    
+    Returns:
+        str: Quoted entity tag
+    """
+    updated_at = user.updated_at
+    if updated_at is not None and updated_at.tzinfo is not None:
+        # Compare the same instant whether or not the database kept the zone
+        updated_at = updated_at.astimezone(timezone.utc).replace(tzinfo=None)
+    version = updated_at.isoformat() if updated_at is not None else ""
+    digest = hashlib.blake2b(f"{user.id}:{version}".encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def _etag_matches(header: str, etag: str, weak: bool) -> bool:
+    """
+    Check whether an If-Match or If-None-Match header lists an ETag.
+    
+    Args:
+        header: The header value: "*" or comma-separated entity tags
+        etag: Our strong entity tag
+        weak: Use weak comparison (If-None-Match), which ignores "W/" prefixes
+    
+    Returns:
+        bool: True if the header matches the tag
+    """
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+async def _get_user_for_write(db: DbSession, current_user: UserSnapshot) -> User:
+    """
+    Load the database row behind a user snapshot so it can be modified.
+    
+    Args:
+        db: Database session
+        current_user: Current authenticated user (possibly from the user cache)
+    
+    Returns:
+        User: The user model instance
+    
+    Raises:
+        HTTPException: If the user no longer exists
+    """
+    user = await crud_user.get(db, current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    return user
+
+
+@router.get(
+    "",
+    response_model=UserPage,
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def list_users(
+    sort: str = Query("id", pattern="^(id|created_at|last_name)$", description="Sort key"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500, description="Page size"),
+    db: DbSession = Depends(get_read_db),
+) -> UserPage:
+    """
+    List users a page at a time (requires admin).
+    
+    Pages are fetched with keyset pagination on ``(sort key, id)``, so
+    following ``next_cursor`` stays fast however deep the listing goes.
+    
+    Args:
+        sort: Sort key ("id", "created_at" or "last_name")
+        cursor: Opaque cursor from the previous page's next_cursor
+        limit: Page size
+        db: Database session
+    
+    Returns:
+        UserPage: The users and the cursor for the next page
+    """
+    after = _decode_cursor(cursor, sort) if cursor else None
+    users = await crud_user.list_page(db, sort=sort, after=after, limit=limit + 1)
+    
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = _encode_cursor(sort, users[-1])
+    return UserPage(items=users, next_cursor=next_cursor)
+
+
+async def _batch_lookup(db: DbSession, ids: List[int]) -> UserBatch:
+    """
+    Look up users by ID, from the user cache first and the database for the rest.
+    
+    Args:
+        db: Database session
+        ids: Requested IDs, possibly repeated
+    
+    Returns:
+        UserBatch: The users in request order, and the IDs not found
+    
+    Raises:
+        HTTPException: If more than USER_BATCH_MAX_IDS IDs are requested
+    """
+    if len(ids) > settings.USER_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"At most {settings.USER_BATCH_MAX_IDS} ids per request",
+        )
+    
+    unique_ids = list(dict.fromkeys(ids))
+    found = {}
+    uncached = []
+    for user_id in unique_ids:
+        snapshot = user_cache.get(user_id)
+        if snapshot is not None:
+            found[user_id] = snapshot
+        else:
+            uncached.append(user_id)
+    
+    for user_id, user in (await crud_user.get_many(db, uncached)).items():
+        snapshot = UserSnapshot.model_validate(user)
+        # The cache only holds active users; get_current_user relies on that
+        if snapshot.is_active:
+            user_cache.set(user_id, snapshot)
+        found[user_id] = snapshot
+    
+    return UserBatch(
+        users=[found.get(user_id) for user_id in ids],
+        missing=[user_id for user_id in unique_ids if user_id not in found],
+    )
+
+
+@router.get(
+    "/batch",
+    response_model=UserBatch,
+    dependencies=[Depends(require_service_key)],
+)
+async def get_users_batch(
+    ids: List[int] = Query(..., description="User IDs, as repeated ids parameters"),
+    db: DbSession = Depends(get_read_db),
+) -> UserBatch:
+    """
+    Look up many users by ID (requires a service key).
+    
+    Args:
+        ids: User IDs to look up
+        db: Database session
+    
+    Returns:
+        UserBatch: One entry per ID in request order (None if not found), and the missing IDs
+    """
+    return await _batch_lookup(db, ids)
+
+
+@router.post(
+    "/batch",
+    response_model=UserBatch,
+    dependencies=[Depends(require_service_key)],
+)
+async def post_users_batch(
+    batch_in: UserBatchRequest,
+    db: DbSession = Depends(get_read_db),
+) -> UserBatch:
+    """
+    Look up many users by ID (requires a service key).
+    
+    Same as GET /batch, for ID lists too long for a URL.
+    
+    Args:
+        batch_in: User IDs to look up
+        db: Database session
+    
+    Returns:
+        UserBatch: One entry per ID in request order (None if not found), and the missing IDs
+    """
+    return await _batch_lookup(db, batch_in.ids)
+
+
+@router.get(
+    "/search",
+    response_model=List[UserSchema],
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to look for"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    db: DbSession = Depends(get_read_db),
+) -> List[UserSchema]:
+    """
+    Search users by partial name or email (requires admin).
+    
+    Every word of the query must start a word in the user's email, first
+    name or last name. Results are ranked, best match first.
+    
+    Args:
+        q: Words to look for
+        limit: Maximum number of results
+        db: Database session
+    
+    Returns:
+        List[UserSchema]: Matching users
+    """
+    return await crud_user.search(db, q, limit=limit)
+
+
+@router.get(
+    "/me",
+    response_model=UserSchema,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
+)
+async def read_users_me(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserSnapshot = Depends(get_current_user),
+) -> Any:
     """
     Get current user information.
     
+    The response carries an ETag. A request whose If-None-Match lists it
+    gets an empty 304 instead; with the user cache warm, that takes no
+    database query and no serialization.
+    
     Args:
+        response: Response object for setting the ETag
+        if_none_match: Entity tags the client already has
         current_user: Current authenticated user
         
     Returns:
-        UserSchema: Current user information
+        UserSchema: Current user information, or a 304 response
     """
+    etag = _user_etag(current_user)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match is not None and _etag_matches(if_none_match, etag, weak=True):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
     return current_user
 
 
-@router.put("/me", response_model=UserSchema)
+@router.put(
+    "/me",
+    response_model=UserSchema,
+    responses={status.HTTP_412_PRECONDITION_FAILED: {"description": "User changed since it was read"}},
+)
 async def update_user_me(
     user_in: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_write_db),
+    current_user: UserSnapshot = Depends(get_current_user),
 ) -> UserSchema:
     """
     Update current user information.
     
+    With If-Match set to the ETag from a previous read, the update only
+    happens if the user has not changed since, so concurrent edits cannot
+    overwrite each other.
+    
     Args:
         user_in: User update data
+        response: Response object for setting the new ETag
+        if_match: Entity tags the update is conditional on
         db: Database session
         current_user: Current authenticated user
         
     Returns:
         UserSchema: Updated user information
+    
+    Raises:
+        HTTPException: If the user changed since the client read it
     """
-    # Update user fields if provided
-    if user_in.first_name is not None:
-        current_user.first_name = user_in.first_name
-    if user_in.last_name is not None:
-        current_user.last_name = user_in.last_name
-    if user_in.phone is not None:
-        current_user.phone = user_in.phone
+    user = await _get_user_for_write(db, current_user)
     
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    if if_match is not None and not _etag_matches(if_match, _user_etag(user), weak=False):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="User was modified; fetch it again",
+        )
     
-    return current_user
+    # Update user fields if provided; with If-Match, only if still unchanged
+    updated = await crud_user.update(db, user, user_in, match_version=if_match is not None)
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="User was modified; fetch it again",
+        )
+    
+    response.headers["ETag"] = _user_etag(updated)
+    return updated
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user_me(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_write_db),
+    current_user: UserSnapshot = Depends(get_current_user),
 ) -> None:
     """
     Delete current user.
@@ -73,5 +398,5 @@ async def delete_user_me(
         db: Database session
         current_user: Current authenticated user
     """
-    db.delete(current_user)
-    db.commit()
+    user = await _get_user_for_write(db, current_user)
+    await crud_user.delete(db, user)
@@ -0,0 +1,143 @@
+"""
+In-process caching utilities for the application.
+
+This module provides a bounded LRU cache with per-entry expiry, and the
+shared cache instances used by the API.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a time-to-live.
+    
+    The least recently used entry is evicted once ``maxsize`` is reached.
+    A ``maxsize`` of 0 disables the cache: every lookup is a miss.
+    
+    Attributes:
+        maxsize: Maximum number of entries
+        ttl: Default time-to-live in seconds
+        hits: Number of lookups served from the cache
+        misses: Number of lookups not found or expired
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Default time-to-live in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value, refreshing its LRU position.
+        
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+        
+        Returns:
+            Any: The cached value, or default if missing or expired
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time-to-live in seconds (defaults to the cache TTL)
+        """
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove a value if present.
+        
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """
+        Remove all values and reset the counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dict[str, Any]: Hits, misses, current size and limits
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+    
+    def __len__(self) -> int:
+        """
+        Get the number of stored entries, including expired ones not yet evicted.
+        
+        Returns:
+            int: Number of entries
+        """
+        return len(self._data)
+
+
+# Snapshots of active users keyed by user id, used by get_current_user.
+# Invalidation is per process, so other workers may serve a stale entry for up to the TTL.
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+# Validated token payloads keyed by a digest of the token, used by decode_access_token.
+# Entries are stored with a TTL ending at the token's own expiry.
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
@@ -9,8 +9,8 @@ import os
 from datetime import timedelta
 from typing import Any, Dict, Optional
 
-from pydantic_settings import BaseSettings
-from pydantic import validator
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -19,26 +19,172 @@ class Settings(BaseSettings):
     
     Attributes:
         PROJECT_NAME: Name of the project
+        APP_PROFILE: Feature profile of the app: "full" (UI, creates tables) or
+            "api" (API only, requires migrated database)
         API_V1_STR: API version prefix
         SECRET_KEY: Secret key for JWT token generation
+        JWT_ALGORITHM: Token signing algorithm (HS256 with SECRET_KEY, or ES256)
+        JWT_PRIVATE_KEYS: ES256 private keys (PEM text or file paths); the first one signs
+        JWT_PUBLIC_KEYS: Retired ES256 public keys that still verify outstanding tokens
         ACCESS_TOKEN_EXPIRE_MINUTES: Expiration time for access tokens
+        REFRESH_TOKEN_EXPIRE_DAYS: Expiration time for refresh tokens
         DATABASE_URL: Database connection URL
+        DATABASE_ASYNC: Use an AsyncEngine/AsyncSession instead of the sync engine
+        ASYNC_DATABASE_URL: Async driver URL (derived from DATABASE_URL if not set)
+        DATABASE_READ_URLS: Read replica URLs; read-only sessions are spread over them
+        DATABASE_READ_STRATEGY: How a replica is picked ("round_robin" or "least_busy")
+        READ_YOUR_WRITES_SECONDS: How long a client reads from the primary after a write
+        SQLITE_TUNING: Apply the SQLITE_* pragmas to every new SQLite connection
+        SQLITE_JOURNAL_MODE: journal_mode pragma (WAL lets readers run during a write)
+        SQLITE_SYNCHRONOUS: synchronous pragma (NORMAL is durable in WAL mode)
+        SQLITE_CACHE_SIZE: cache_size pragma (negative values are KiB)
+        SQLITE_MMAP_SIZE: mmap_size pragma in bytes (0 disables memory mapping)
+        SQLITE_TEMP_STORE: temp_store pragma (DEFAULT, FILE or MEMORY)
+        SQLITE_BUSY_TIMEOUT_MS: How long a connection waits for a lock before failing
+        PASSWORD_SCHEMES: Password hash schemes, preferred first; older ones are rehashed on login
+        BCRYPT_ROUNDS: bcrypt cost factor (see python -m app.tune_password_hash)
+        PASSWORD_HASH_WORKERS: Processes used for password hashing (None = CPU count, 0 = threads)
+        PASSWORD_HASH_QUEUE_SIZE: Hashing jobs allowed to wait for a free worker
+        USER_CACHE_SIZE: Maximum cached user snapshots (0 disables the cache)
+        USER_CACHE_TTL_SECONDS: How long a cached user snapshot stays valid
+        SERVICE_API_KEYS: Keys internal services send in X-Service-Key (empty disables service routes)
+        USER_BATCH_MAX_IDS: Most user ids one batch lookup may ask for
+        TOKEN_CACHE_SIZE: Maximum cached verified access tokens (0 disables the cache)
+        RATE_LIMIT_STORAGE_URI: Where rate limit counters live ("memory://" is per process)
+        RATE_LIMIT_STRATEGY: Rate limit algorithm ("fixed-window", "sliding-window-counter", ...)
+        LOGIN_ACCOUNT_FREE_ATTEMPTS: Failed logins per account before backoff starts
+        LOGIN_IP_FREE_ATTEMPTS: Failed logins per client IP before backoff starts
+        LOGIN_BACKOFF_BASE_SECONDS: First backoff delay; it doubles with each further failure
+        LOGIN_BACKOFF_MAX_SECONDS: Longest backoff delay
+        LOGIN_FAILURE_WINDOW_SECONDS: How long failed logins are remembered, from the first one
+        BULK_IMPORT_BATCH_SIZE: Rows hashed and inserted per transaction by the bulk import
+        BULK_IMPORT_MAX_LINE_BYTES: Longest accepted line in a bulk import body
+        EXPORT_PAGE_SIZE: Rows fetched per keyset page by the user export
+        METRICS_ENABLED: Record request metrics (served at /metrics either way)
+        SQL_QUERY_STATS: Count the SQL statements of each request
+        SQL_SLOW_QUERY_MS: Log statements slower than this (0 disables the log)
+        PROFILE_SAMPLE_RATE: Fraction of requests to profile (0 disables sampling)
+        PROFILE_HEADER: Request header that asks for a profile
+        PROFILE_HEADER_TOKEN: Secret the profile header must carry (None ignores the header)
+        PROFILE_DIR: Where request profiles are written
+        PROFILE_INTERVAL_SECONDS: Time between stack samples of a profiled request
+        PROFILE_MAX_FILES: Number of request profiles kept; older ones are deleted
+        SERVER_HOST: Address the production server binds to
+        SERVER_PORT: Port the production server listens on
+        SERVER_WORKERS: Worker processes (None = one per CPU allowed by the cgroup quota)
+        SERVER_PRELOAD: Import the app before forking so workers share its memory
+        SERVER_MAX_REQUESTS: Requests after which a worker is gracefully replaced (0 = never)
+        SERVER_MAX_REQUESTS_JITTER: Random extra requests so workers do not restart together
+        SERVER_KEEPALIVE_SECONDS: How long idle keep-alive connections are held open
+        SERVER_BACKLOG: Pending connections the listen socket queues
+        SERVER_TIMEOUT_SECONDS: Silence after which a worker is killed and replaced
+        SERVER_GRACEFUL_TIMEOUT_SECONDS: Time a worker gets to finish requests on restart
+        SERVER_FORWARDED_ALLOW_IPS: Proxies trusted to set X-Forwarded-* headers
         TESTING: Flag to indicate if the application is in testing mode
     """
+    
+    model_config = SettingsConfigDict(case_sensitive=True, env_file=".env")
 
     PROJECT_NAME: str = "SimpleUser Management API"
+    APP_PROFILE: str = "full"
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = "YOUR_SECRET_KEY_HERE"  # In production use another secure key
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # 15 minutes
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    JWT_ALGORITHM: str = "HS256"
+    JWT_PRIVATE_KEYS: list[str] = []
+    JWT_PUBLIC_KEYS: list[str] = []
     DATABASE_URL: str = "sqlite:///./app.db"
+    DATABASE_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+    
+    # Read replica settings
+    DATABASE_READ_URLS: list[str] = []
+    DATABASE_READ_STRATEGY: str = "round_robin"
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    
+    # SQLite tuning, applied on connect
+    SQLITE_TUNING: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE: int = -64000
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    
+    # Password hashing policy
+    PASSWORD_SCHEMES: list[str] = ["bcrypt"]
+    BCRYPT_ROUNDS: int = 12
+    
+    # Password hashing pool settings
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    
+    # User cache settings
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    
+    # Service-to-service access
+    SERVICE_API_KEYS: list[str] = []
+    USER_BATCH_MAX_IDS: int = 500
+    
+    # Verified access token cache settings
+    TOKEN_CACHE_SIZE: int = 10000
+    
+    # Rate limit settings; use e.g. sqlite:///./ratelimit.db to share limits between workers
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+    RATE_LIMIT_STRATEGY: str = "sliding-window-counter"
+    
+    # Login throttle settings
+    LOGIN_ACCOUNT_FREE_ATTEMPTS: int = 5
+    LOGIN_IP_FREE_ATTEMPTS: int = 20
+    LOGIN_BACKOFF_BASE_SECONDS: float = 1.0
+    LOGIN_BACKOFF_MAX_SECONDS: float = 900.0
+    LOGIN_FAILURE_WINDOW_SECONDS: float = 900.0
+    
+    # Bulk import settings
+    BULK_IMPORT_BATCH_SIZE: int = 500
+    BULK_IMPORT_MAX_LINE_BYTES: int = 65536
+    
+    # Export settings
+    EXPORT_PAGE_SIZE: int = 1000
     
     # CORS settings
     BACKEND_CORS_ORIGINS: list[str] = ["*"]
     
+    # Metrics settings
+    METRICS_ENABLED: bool = True
+    
+    # SQL instrumentation settings
+    SQL_QUERY_STATS: bool = True
+    SQL_SLOW_QUERY_MS: float = 100.0
+    
+    # Request profiling settings; the middleware is only installed when enabled
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_HEADER: str = "X-Profile"
+    PROFILE_HEADER_TOKEN: Optional[str] = None
+    PROFILE_DIR: str = "./profiles"
+    PROFILE_INTERVAL_SECONDS: float = 0.001
+    PROFILE_MAX_FILES: int = 200
+    
+    # Production server settings (python -m app.server)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_PRELOAD: bool = True
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_BACKLOG: int = 2048
+    SERVER_TIMEOUT_SECONDS: int = 60
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    
     # Testing flag
     TESTING: bool = False
     
-    @validator("BACKEND_CORS_ORIGINS", pre=True)
+    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    @classmethod
     def assemble_cors_origins(cls, v: str | list[str]) -> list[str] | str:
         """
         Validate CORS origins.
@@ -55,13 +201,6 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
 
-    class Config:
-        """
-        Pydantic config class.
-        """
-        case_sensitive = True
-        env_file = ".env"
-
 
 # Create settings instance
 settings = Settings()
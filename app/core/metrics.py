@@ -0,0 +1,243 @@
+"""
+Prometheus metrics for the application.
+
+This module defines the service metrics, an ASGI middleware recording
+per-route request counts and latencies, and SQLAlchemy hooks recording
+query and connection pool activity.
+
+With several worker processes, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory before the workers start so /metrics aggregates all of them.
+"""
+
+import os
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Latency buckets from 1 ms to 10 s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Fast operations (JWT, SQL) get finer buckets from 50 µs to 1 s
+FAST_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 1.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and method",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Password hashing and verification time, including the wait for a worker",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+JWT_DURATION = Histogram(
+    "jwt_duration_seconds",
+    "Access token signing and verification time (verification on token cache misses only)",
+    ["operation"],
+    buckets=FAST_BUCKETS,
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed")
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    buckets=FAST_BUCKETS,
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements run per request, by route template",
+    ["route"],
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 50, 100),
+)
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections checked out of the pool")
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", multiprocess_mode="livesum"
+)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+    
+    Returns:
+        Tuple[bytes, str]: The exposition body and its content type
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def _route_template(scope: Dict[str, Any]) -> str:
+    """
+    Get the route template that handled a request, e.g. ``/api/v1/users/me``.
+    
+    FastAPI versions that keep included routes unflattened record the
+    route relative to its router, along with the prefix it was included at.
+    
+    Args:
+        scope: ASGI connection scope, after routing
+    
+    Returns:
+        str: The full route template, or "<unmatched>"
+    """
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if path is None:
+        return "<unmatched>"
+    included = scope.get("fastapi", {}).get("included_router")
+    prefix = getattr(getattr(included, "include_context", None), "prefix", "")
+    return prefix + path
+
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware recording request counts and latencies per route.
+    
+    Requests are labelled with the matched route template (e.g.
+    ``/api/v1/users/me``), not the raw path, so label cardinality stays
+    bounded. Latency runs until the last byte of the response is sent.
+    """
+    
+    def __init__(self, app: Callable):
+        """
+        Initialize the middleware.
+        
+        Args:
+            app: The ASGI app to wrap
+        """
+        self.app = app
+    
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        """
+        Handle an ASGI connection.
+        
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status_code = 500
+        
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route_path = _route_template(scope)
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, route_path, str(status_code)).inc()
+            HTTP_REQUEST_DURATION.labels(method, route_path).observe(time.perf_counter() - start)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """
+    Engine event handler that notes when a statement starts.
+    
+    Args:
+        conn: The SQLAlchemy connection
+        cursor: The DBAPI cursor
+        statement: The SQL text
+        parameters: The statement parameters
+        context: The execution context
+        executemany: Whether the statement runs for many parameter sets
+    """
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """
+    Engine event handler that records a finished statement.
+    
+    Args:
+        conn: The SQLAlchemy connection
+        cursor: The DBAPI cursor
+        statement: The SQL text
+        parameters: The statement parameters
+        context: The execution context
+        executemany: Whether the statement runs for many parameter sets
+    """
+    started = conn.info["metrics_query_start"].pop()
+    DB_QUERIES.inc()
+    DB_QUERY_DURATION.observe(time.perf_counter() - started)
+
+
+def _handle_error(context) -> None:
+    """
+    Engine event handler that drops the start time of a failed statement.
+    
+    Args:
+        context: The SQLAlchemy exception context
+    """
+    connection = context.connection
+    if connection is not None and connection.info.get("metrics_query_start"):
+        connection.info["metrics_query_start"].pop()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    """
+    Pool event handler for a connection leaving the pool.
+    
+    Args:
+        dbapi_connection: The DBAPI connection
+        connection_record: The pool's record for the connection
+        connection_proxy: The pooled connection proxy
+    """
+    DB_POOL_CHECKOUTS.inc()
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    """
+    Pool event handler for a connection returning to the pool.
+    
+    Args:
+        dbapi_connection: The DBAPI connection
+        connection_record: The pool's record for the connection
+    """
+    DB_POOL_CHECKED_OUT.dec()
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """
+    Record query counts, query time and pool checkouts for an engine.
+    
+    Args:
+        engine: A sync engine (use ``AsyncEngine.sync_engine`` for async ones)
+    
+    Returns:
+        Engine: The same engine
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    event.listen(engine.pool, "checkout", _on_checkout)
+    event.listen(engine.pool, "checkin", _on_checkin)
+    return engine
@@ -0,0 +1,225 @@
+"""
+Sampled request profiling for the application.
+
+This module provides a statistical stack sampler and an ASGI middleware
+that profiles a fraction of requests, or requests carrying a trusted
+header, and writes each profile as folded stacks (the input format of
+flamegraph.pl, speedscope and inferno) to a directory with bounded
+retention.
+"""
+
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _frame_label(code: Any) -> str:
+    """
+    Format a code object as a flamegraph frame.
+    
+    Args:
+        code: The frame's code object
+    
+    Returns:
+        str: "function (dir/file.py:line)"
+    """
+    path = "/".join(code.co_filename.replace("\\", "/").rsplit("/", 2)[-2:])
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the stacks of every thread at a fixed interval from a background thread.
+    
+    Stacks are counted as they are sampled, so memory grows with the number
+    of distinct stacks, not with the duration.
+    
+    Attributes:
+        interval: Seconds between samples
+        stacks: Sample count per folded stack ("thread;outer;...;inner")
+    """
+    
+    def __init__(self, interval: float):
+        """
+        Initialize the sampler.
+        
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._on_stop: Optional[Callable[["StackSampler"], None]] = None
+    
+    def start(self) -> None:
+        """
+        Start sampling.
+        """
+        self._thread.start()
+    
+    def stop(self, on_stop: Optional[Callable[["StackSampler"], None]] = None) -> None:
+        """
+        Stop sampling without waiting for the sampler thread.
+        
+        Args:
+            on_stop: Called on the sampler thread once sampling has ended,
+                e.g. to write the profile without blocking the caller
+        """
+        self._on_stop = on_stop
+        self._stop.set()
+    
+    def _sample(self) -> None:
+        """
+        Record one sample of every thread except the sampler.
+        """
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(labels))] += 1
+    
+    def _run(self) -> None:
+        """
+        Sampler thread body.
+        """
+        while not self._stop.wait(self.interval):
+            self._sample()
+        if self._on_stop is not None:
+            self._on_stop(self)
+    
+    def folded(self) -> str:
+        """
+        Get the profile in folded stack format.
+        
+        Returns:
+            str: One "stack count" line per distinct stack
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def write_profile(directory: str, name: str, sampler: StackSampler, max_files: int) -> str:
+    """
+    Write a profile and delete the oldest ones beyond the retention limit.
+    
+    Args:
+        directory: Output directory (created if missing)
+        name: File name without extension
+        sampler: The stopped sampler
+        max_files: Number of profiles to keep
+    
+    Returns:
+        str: Path of the written file
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{_UNSAFE_CHARS.sub('_', name)}.folded")
+    with open(path, "w") as f:
+        f.write(sampler.folded())
+    
+    profiles = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(".folded")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in profiles[: max(0, len(profiles) - max_files)]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+    return path
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling sampled requests.
+    
+    A request is profiled with probability ``sample_rate``, or always when
+    it carries ``header`` set to ``header_token``. The sampler sees every
+    thread, so concurrent requests and threadpool work show up too; each
+    stack starts with its thread name. Profiles are written from the
+    sampler thread, never the event loop.
+    """
+    
+    def __init__(
+        self,
+        app: Callable,
+        directory: str,
+        sample_rate: float = 0.0,
+        header: str = "x-profile",
+        header_token: Optional[str] = None,
+        interval: float = 0.001,
+        max_files: int = 200,
+    ):
+        """
+        Initialize the middleware.
+        
+        Args:
+            app: The ASGI app to wrap
+            directory: Where profiles are written
+            sample_rate: Fraction of requests to profile (0 to 1)
+            header: Request header that asks for a profile
+            header_token: Value the header must have; None ignores the header
+            interval: Seconds between stack samples
+            max_files: Number of profiles to keep
+        """
+        self.app = app
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.header = header.lower().encode("latin-1")
+        self.header_token = header_token.encode("latin-1") if header_token else None
+        self.interval = interval
+        self.max_files = max_files
+    
+    def _wants_profile(self, scope: Dict[str, Any]) -> bool:
+        """
+        Decide whether to profile a request.
+        
+        Args:
+            scope: ASGI connection scope
+        
+        Returns:
+            bool: True if the request should be profiled
+        """
+        if self.header_token is not None:
+            for name, value in scope.get("headers", ()):
+                if name == self.header and hmac.compare_digest(value, self.header_token):
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+    
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        """
+        Handle an ASGI connection.
+        
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        sampler = StackSampler(self.interval)
+        started = time.time()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed_ms = (time.time() - started) * 1000
+            name = f"{started:.6f}-{scope['method']}-{scope['path'].strip('/')}-{elapsed_ms:.0f}ms"
+            sampler.stop(
+                lambda stopped: write_profile(self.directory, name, stopped, self.max_files)
+            )
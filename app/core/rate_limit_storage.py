@@ -0,0 +1,297 @@
+"""
+Rate limit storage shared between worker processes.
+
+This module provides a ``limits`` storage backend kept in a SQLite file, so
+every worker on a host counts against the same limits. Register it by
+importing this module, then use a ``sqlite:///path/to/file.db`` storage URI.
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from limits.errors import ConfigurationError
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport, TimestampedSlidingWindow
+
+# Delete expired counters at most this often, per process
+PURGE_INTERVAL_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+# One statement, so the read-modify-write is atomic across processes
+_INCR = """
+INSERT INTO rate_limits (key, count, expires_at) VALUES (:key, :amount, :now + :expiry)
+ON CONFLICT (key) DO UPDATE SET
+    count = CASE WHEN expires_at <= :now THEN :amount ELSE count + :amount END,
+    expires_at = CASE WHEN expires_at <= :now THEN :now + :expiry ELSE expires_at END
+RETURNING count
+"""
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """
+    Rate limit counters in a SQLite file, for the fixed-window and
+    sliding-window-counter strategies.
+    
+    Each thread keeps its own connection in WAL mode, so a check is one or
+    two indexed statements without a connect. Increments are single upserts;
+    a sliding window check and its increment share one write transaction.
+    """
+    
+    STORAGE_SCHEME = ["sqlite"]
+    
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        """
+        Initialize the storage and create its table.
+        
+        Args:
+            uri: ``sqlite:///relative.db`` or ``sqlite:////absolute.db``
+            wrap_exceptions: Wrap sqlite3 errors in ``limits.errors.StorageError``
+            **options: Unused
+        
+        Raises:
+            ConfigurationError: If the URI names no file, or an in-memory database
+        """
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = uri.split("://", 1)[1][1:]
+        # Each thread opens its own connection, and each in-memory connection is
+        # a separate, empty database
+        if self.path in ("", ":memory:") or "mode=memory" in self.path:
+            raise ConfigurationError(
+                f"Rate limit storage {uri!r} needs a database file; "
+                "use memory:// for counters kept in process memory"
+            )
+        self._local = threading.local()
+        self._next_purge = 0.0
+        self._connect().execute(_SCHEMA)
+    
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        """
+        Exceptions that are wrapped when wrap_exceptions is set.
+        
+        Returns:
+            type[Exception]: sqlite3.Error
+        """
+        return sqlite3.Error
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get this thread's connection, opening it on first use.
+        
+        Returns:
+            sqlite3.Connection: Connection in autocommit mode
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+    
+    def _purge(self, connection: sqlite3.Connection, now: float) -> None:
+        """
+        Delete expired counters, at most every PURGE_INTERVAL_SECONDS.
+        
+        Args:
+            connection: Connection to use
+            now: Current time
+        """
+        if now >= self._next_purge:
+            self._next_purge = now + PURGE_INTERVAL_SECONDS
+            connection.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+    
+    def _read(
+        self, connection: sqlite3.Connection, key: str, now: float
+    ) -> Tuple[int, Optional[float]]:
+        """
+        Read a counter that has not expired.
+        
+        Args:
+            connection: Connection to use
+            key: Counter key
+            now: Current time
+        
+        Returns:
+            Tuple[int, Optional[float]]: The count and expiry time, or (0, None)
+        """
+        row = connection.execute(
+            "SELECT count, expires_at FROM rate_limits WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+        return (row[0], row[1]) if row else (0, None)
+    
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        """
+        Increment a counter, starting a new window if it expired.
+        
+        Args:
+            key: Counter key
+            expiry: Window length in seconds
+            amount: Amount to add
+        
+        Returns:
+            int: The new count
+        """
+        now = time.time()
+        connection = self._connect()
+        self._purge(connection, now)
+        return connection.execute(
+            _INCR, {"key": key, "amount": amount, "now": now, "expiry": expiry}
+        ).fetchone()[0]
+    
+    def get(self, key: str) -> int:
+        """
+        Get a counter.
+        
+        Args:
+            key: Counter key
+        
+        Returns:
+            int: The count, or 0 if missing or expired
+        """
+        return self._read(self._connect(), key, time.time())[0]
+    
+    def get_expiry(self, key: str) -> float:
+        """
+        Get when a counter expires.
+        
+        Args:
+            key: Counter key
+        
+        Returns:
+            float: Expiry as a Unix timestamp (now if missing)
+        """
+        now = time.time()
+        return self._read(self._connect(), key, now)[1] or now
+    
+    def check(self) -> bool:
+        """
+        Check that the database is usable.
+        
+        Returns:
+            bool: True if a trivial query succeeds
+        """
+        try:
+            self._connect().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def reset(self) -> Optional[int]:
+        """
+        Delete every counter.
+        
+        Returns:
+            Optional[int]: Number of counters deleted
+        """
+        return self._connect().execute("DELETE FROM rate_limits").rowcount
+    
+    def clear(self, key: str) -> None:
+        """
+        Delete a counter.
+        
+        Args:
+            key: Counter key
+        """
+        self._connect().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+    
+    def _sliding_window(
+        self, connection: sqlite3.Connection, key: str, expiry: int, now: float
+    ) -> Tuple[str, int, float, int, float]:
+        """
+        Read the previous and current window of a sliding window counter.
+        
+        Args:
+            connection: Connection to use
+            key: Rate limit key
+            expiry: Window length in seconds
+            now: Current time
+        
+        Returns:
+            Tuple[str, int, float, int, float]: Current window key, previous
+            count and TTL, current count and TTL
+        """
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._read(connection, previous_key, now)[0]
+        current_count = self._read(connection, current_key, now)[0]
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return current_key, previous_count, previous_ttl, current_count, current_ttl
+    
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        """
+        Count a hit if the weighted count of both windows stays within the limit.
+        
+        Args:
+            key: Rate limit key
+            limit: Hits allowed per window
+            expiry: Window length in seconds
+            amount: Hits to count
+        
+        Returns:
+            bool: True if the hit was allowed and counted
+        """
+        if amount > limit:
+            return False
+        now = time.time()
+        connection = self._connect()
+        self._purge(connection, now)
+        
+        # IMMEDIATE takes the write lock up front, so no other process can
+        # count a hit between our read and our increment
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            current_key, previous_count, previous_ttl, current_count, _ = self._sliding_window(
+                connection, key, expiry, now
+            )
+            weighted_count = previous_count * previous_ttl / expiry + current_count
+            allowed = math.floor(weighted_count) + amount <= limit
+            if allowed:
+                # Keep the window around for one more window, as the previous one
+                connection.execute(
+                    _INCR, {"key": current_key, "amount": amount, "now": now, "expiry": 2 * expiry}
+                ).fetchone()
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return allowed
+    
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        """
+        Get the previous and current window of a sliding window counter.
+        
+        Args:
+            key: Rate limit key
+            expiry: Window length in seconds
+        
+        Returns:
+            Tuple[int, float, int, float]: Previous count and TTL, current count and TTL
+        """
+        return self._sliding_window(self._connect(), key, expiry, time.time())[1:]
+    
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        """
+        Delete both windows of a sliding window counter.
+        
+        Args:
+            key: Rate limit key
+            expiry: Window length in seconds
+        """
+        for window_key in self.sliding_window_keys(key, expiry, time.time()):
+            self.clear(window_key)
@@ -4,18 +4,26 @@ Rate limiting utilities for the application.
 This module provides decorators and functions for implementing rate limiting on API endpoints.
 """
 
+import math
+import time
 from functools import wraps
-from typing import Callable
+from typing import Callable, Iterable, List
 
-from fastapi import Request
+from fastapi import HTTPException, Request, status
+from limits.storage import Storage
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from app.core import rate_limit_storage  # noqa: F401  (registers the sqlite:// storage scheme)
 from app.core.config import settings
 
 # Initialize rate limiter
 # This instance should be used throughout the application
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+)
 
 
 def rate_limit(limit_value: str) -> Callable:
@@ -54,3 +62,157 @@ def register_rate_limit() -> Callable:
         Callable: Decorator function
     """
     return rate_limit("3/minute")
+
+
+class LoginThrottle:
+    """
+    Tracks failed logins per key and blocks keys with exponential backoff.
+    
+    Counters live in the rate limiter's storage (RATE_LIMIT_STORAGE_URI),
+    next to the other limits, so workers sharing that storage share the
+    throttle. slowapi limits count every request, while backoff must count
+    failures only and grow with each one, so this uses the storage directly
+    rather than ``limiter.limit``.
+    
+    Each key gets ``free_attempts`` failures within ``window`` seconds of
+    its first failure; every further failure blocks it for
+    ``base_delay * 2 ** n`` seconds, up to ``max_delay``.
+    """
+    
+    def __init__(
+        self,
+        storage: Storage,
+        window: float,
+        base_delay: float,
+        max_delay: float,
+    ):
+        """
+        Initialize the throttle.
+        
+        Args:
+            storage: Rate limit storage holding the counters
+            window: Seconds after the first failure before a key's failures are forgotten
+            base_delay: Block after the first failure beyond the free attempts
+            max_delay: Longest block
+        """
+        self.storage = storage
+        self.window = window
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    def retry_after(self, keys: Iterable[str]) -> float:
+        """
+        Get how long the most restricted of the keys is still blocked.
+        
+        Args:
+            keys: Keys to check
+        
+        Returns:
+            float: Seconds until all keys are unblocked (0 if none are blocked)
+        """
+        now = time.time()
+        blocked_until = max(
+            (
+                self.storage.get_expiry(f"{key}/blocked")
+                for key in keys
+                if self.storage.get(f"{key}/blocked")
+            ),
+            default=0.0,
+        )
+        return max(0.0, blocked_until - now)
+    
+    def record_failure(self, key: str, free_attempts: int) -> None:
+        """
+        Count a failed login against a key, blocking it if over its allowance.
+        
+        Args:
+            key: Key that failed
+            free_attempts: Failures allowed before backoff starts
+        """
+        failures = self.storage.incr(f"{key}/failures", math.ceil(self.window))
+        if failures > free_attempts:
+            delay = min(self.base_delay * 2 ** (failures - free_attempts - 1), self.max_delay)
+            self.storage.clear(f"{key}/blocked")
+            self.storage.incr(f"{key}/blocked", math.ceil(delay))
+    
+    def reset(self, key: str) -> None:
+        """
+        Forget a key's failures, e.g. after a successful login.
+        
+        Args:
+            key: Key to forget
+        """
+        self.storage.clear(f"{key}/failures")
+        self.storage.clear(f"{key}/blocked")
+
+
+# Failed login tracker, in the same storage as the other rate limits
+login_throttle = LoginThrottle(
+    storage=limiter.limiter.storage,
+    window=settings.LOGIN_FAILURE_WINDOW_SECONDS,
+    base_delay=settings.LOGIN_BACKOFF_BASE_SECONDS,
+    max_delay=settings.LOGIN_BACKOFF_MAX_SECONDS,
+)
+
+
+def _login_keys(request: Request, username: str) -> List[str]:
+    """
+    Get the throttle keys for a login attempt.
+    
+    Args:
+        request: The incoming request
+        username: The email being logged into
+    
+    Returns:
+        List[str]: The account key and the client IP key
+    """
+    return [f"login/account/{username.strip().lower()}", f"login/ip/{get_remote_address(request)}"]
+
+
+def login_rate_limit() -> Callable:
+    """
+    Decorator for throttling the login endpoint.
+    
+    Rejects an attempt with 429 while its account or client IP is backing
+    off, before any password is verified. A 401 from the endpoint counts as
+    a failure for both keys; a success clears the account's failures. The
+    endpoint must take ``request`` and ``login_data`` arguments. Skipped
+    in testing mode, like rate_limit.
+    
+    The account key counts failures from any address, so anyone who knows
+    an email can keep that account backing off, for at most
+    LOGIN_BACKOFF_MAX_SECONDS at a time. This is the price of stopping
+    guesses spread over many addresses; LOGIN_ACCOUNT_FREE_ATTEMPTS and
+    LOGIN_BACKOFF_MAX_SECONDS bound it.
+    
+    Returns:
+        Callable: Decorator function
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            # Skip throttling if in testing mode
+            if settings.TESTING:
+                return await func(*args, **kwargs)
+            
+            account_key, ip_key = _login_keys(kwargs["request"], kwargs["login_data"].username)
+            
+            retry_after = login_throttle.retry_after((account_key, ip_key))
+            if retry_after > 0:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many failed login attempts, try again later",
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+            
+            try:
+                result = await func(*args, **kwargs)
+            except HTTPException as exc:
+                if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+                    login_throttle.record_failure(account_key, settings.LOGIN_ACCOUNT_FREE_ATTEMPTS)
+                    login_throttle.record_failure(ip_key, settings.LOGIN_IP_FREE_ATTEMPTS)
+                raise
+            login_throttle.reset(account_key)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,38 @@
+"""
+Response classes for the application.
+
+This module provides a JSON response that serializes with pydantic-core
+straight to bytes.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+# Serializer for arbitrary JSON content (dicts, lists, models, datetimes)
+_json_adapter = TypeAdapter(Any)
+
+
+class JSONBytesResponse(JSONResponse):
+    """
+    JSON response serialized by pydantic-core instead of ``json.dumps``.
+    
+    Routes with a ``response_model`` do not need it: FastAPI already dumps
+    their models to JSON bytes, but only while the app keeps its default
+    response class. Use this class for routes and handlers that return
+    plain dicts or lists.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        """
+        Serialize the response content.
+        
+        Args:
+            content: JSON-compatible content, which may contain pydantic
+                models and datetimes
+        
+        Returns:
+            bytes: Compact JSON
+        """
+        return _json_adapter.dump_json(content)
@@ -4,16 +4,50 @@ Security utilities for the application.
 This module provides functions for password hashing, JWT token generation and validation.
 """
 
+import asyncio
+import base64
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from jose import jwt
+from jose import jwk, jwt
+from jose.exceptions import JWTError
 from passlib.context import CryptContext
 
+from app.core.cache import token_cache
 from app.core.config import settings
+from app.core.metrics import JWT_DURATION, PASSWORD_HASH_DURATION
+from app.schemas.token import TokenPayload
+
+
+def build_pwd_context(schemes: List[str], bcrypt_rounds: int) -> CryptContext:
+    """
+    Create the password hashing policy.
+    
+    The first scheme hashes new passwords. The others only verify existing
+    hashes and are reported as outdated, as are bcrypt hashes whose cost is
+    not ``bcrypt_rounds``.
+    
+    Args:
+        schemes: passlib scheme names, preferred first (e.g. ["argon2", "bcrypt"])
+        bcrypt_rounds: bcrypt cost factor (log2 of the work)
+    
+    Returns:
+        CryptContext: The hashing policy
+    """
+    return CryptContext(schemes=schemes, deprecated="auto", bcrypt__rounds=bcrypt_rounds)
+
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = build_pwd_context(settings.PASSWORD_SCHEMES, settings.BCRYPT_ROUNDS)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -43,6 +77,473 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its hash no longer matches the policy.
+    
+    Args:
+        plain_password: The plain-text password
+        hashed_password: The hashed password
+    
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matches, and a new
+        hash to store when the old one uses an outdated scheme or cost
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when every hashing worker is busy and the wait queue is full.
+    """
+
+
+# Hashing executor, created lazily so that forked server workers each get their own
+_hash_executor: Optional[Executor] = None
+_hash_workers = 0
+_hash_slots: Optional[threading.BoundedSemaphore] = None
+_hash_executor_lock = threading.Lock()
+
+
+def _get_hash_executor() -> Tuple[Executor, threading.BoundedSemaphore, int]:
+    """
+    Get the executor used for password hashing, creating it on first use.
+    
+    The executor, its queue slots and its worker count are read under one
+    lock, so a concurrent shutdown cannot hand out a half-torn-down pool.
+    
+    Returns:
+        Tuple[Executor, threading.BoundedSemaphore, int]: Process pool (or thread
+        pool when PASSWORD_HASH_WORKERS is 0), its queue slots and its worker count
+    """
+    global _hash_executor, _hash_workers, _hash_slots
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            workers = settings.PASSWORD_HASH_WORKERS
+            if workers == 0:
+                # bcrypt releases the GIL, so threads still keep the event loop free
+                workers = os.cpu_count() or 1
+                _hash_executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="password-hash"
+                )
+            else:
+                workers = workers or os.cpu_count() or 1
+                # "spawn" avoids forking a process that already runs threads
+                _hash_executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            _hash_workers = workers
+            _hash_slots = threading.BoundedSemaphore(
+                workers + settings.PASSWORD_HASH_QUEUE_SIZE
+            )
+        return _hash_executor, _hash_slots, _hash_workers
+
+
+async def _run_in_hash_executor(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a hashing function on the hashing executor without blocking the event loop.
+    
+    The time until the result is back, including any wait for a free worker,
+    is recorded in the password_hash_duration_seconds metric under the
+    function's name.
+    
+    Args:
+        func: Picklable function to run
+        *args: Arguments for the function
+    
+    Returns:
+        Any: The function result
+    
+    Raises:
+        PasswordHasherBusy: If the executor queue is full
+    """
+    executor, slots, _ = _get_hash_executor()
+    if not slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        future = executor.submit(func, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    with PASSWORD_HASH_DURATION.labels(func.__name__).time():
+        return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against a hash on the hashing executor.
+    
+    Args:
+        plain_password: The plain-text password
+        hashed_password: The hashed password
+    
+    Returns:
+        bool: True if the password matches the hash
+    
+    Raises:
+        PasswordHasherBusy: If the executor queue is full
+    """
+    return await _run_in_hash_executor(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password, and rehash it if outdated, on the hashing executor.
+    
+    Args:
+        plain_password: The plain-text password
+        hashed_password: The hashed password
+    
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matches, and a new
+        hash to store if the old one is outdated
+    
+    Raises:
+        PasswordHasherBusy: If the executor queue is full
+    """
+    return await _run_in_hash_executor(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the hashing executor.
+    
+    Args:
+        password: The password to hash
+    
+    Returns:
+        str: The hashed password
+    
+    Raises:
+        PasswordHasherBusy: If the executor queue is full
+    """
+    return await _run_in_hash_executor(get_password_hash, password)
+
+
+def _hash_many(passwords: List[str]) -> List[str]:
+    """
+    Hash several passwords in one executor job.
+    
+    Args:
+        passwords: The passwords to hash
+    
+    Returns:
+        List[str]: The hashed passwords, in order
+    """
+    return [get_password_hash(password) for password in passwords]
+
+
+async def get_password_hashes_async(passwords: List[str], chunk_size: int = 4) -> List[str]:
+    """
+    Hash many passwords across the hashing workers, for bulk operations.
+    
+    Passwords are hashed in small chunks with at most one chunk per worker in
+    flight, so interactive logins never queue behind more than one chunk.
+    Unlike the single-password helpers, this waits for queue space instead of
+    raising PasswordHasherBusy.
+    
+    Args:
+        passwords: The passwords to hash
+        chunk_size: Passwords per executor job
+    
+    Returns:
+        List[str]: The hashed passwords, in order
+    """
+    _, _, workers = _get_hash_executor()
+    in_flight = asyncio.Semaphore(workers)
+    
+    async def hash_chunk(chunk: List[str]) -> List[str]:
+        async with in_flight:
+            while True:
+                try:
+                    return await _run_in_hash_executor(_hash_many, chunk)
+                except PasswordHasherBusy:
+                    await asyncio.sleep(0.05)
+    
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+    results = await asyncio.gather(*(hash_chunk(chunk) for chunk in chunks))
+    return [hashed for chunk in results for hashed in chunk]
+
+
+def shutdown_password_hasher() -> None:
+    """
+    Shut down the hashing executor. It is recreated on next use.
+    """
+    global _hash_executor, _hash_workers, _hash_slots
+    with _hash_executor_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=True, cancel_futures=True)
+            _hash_executor = None
+            _hash_workers = 0
+            _hash_slots = None
+
+
+class TokenSigner(ABC):
+    """
+    Signs and verifies JWT tokens with one algorithm.
+    
+    Attributes:
+        algorithm: JWT algorithm name
+        cache_namespace: Bytes identifying the verification keys; changes on key rotation
+    """
+    
+    algorithm: str
+    cache_namespace: bytes
+    
+    @abstractmethod
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """
+        Sign claims into a JWT token.
+        
+        Args:
+            claims: Token claims
+        
+        Returns:
+            str: The encoded JWT token
+        """
+    
+    @abstractmethod
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a JWT token and return its claims.
+        
+        Args:
+            token: The encoded JWT token
+        
+        Returns:
+            Dict[str, Any]: The token claims
+        
+        Raises:
+            JWTError: If the token is invalid or expired
+        """
+    
+    def jwks(self) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Get the public verification keys as a JSON Web Key Set.
+        
+        Returns:
+            Dict[str, List[Dict[str, str]]]: The key set
+        """
+        return {"keys": []}
+
+
+class HMACSigner(TokenSigner):
+    """
+    HS256 signer using the shared SECRET_KEY. Publishes no keys.
+    """
+    
+    algorithm = "HS256"
+    
+    def __init__(self, secret_key: str):
+        """
+        Initialize the signer.
+        
+        Args:
+            secret_key: Shared signing secret
+        """
+        self._secret_key = secret_key
+        self.cache_namespace = hashlib.sha256(secret_key.encode()).digest()
+    
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """
+        Sign claims with the shared secret.
+        
+        Args:
+            claims: Token claims
+        
+        Returns:
+            str: The encoded JWT token
+        """
+        return jwt.encode(claims, self._secret_key, algorithm=self.algorithm)
+    
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token with the shared secret.
+        
+        Args:
+            token: The encoded JWT token
+        
+        Returns:
+            Dict[str, Any]: The token claims
+        
+        Raises:
+            JWTError: If the token is invalid or expired
+        """
+        return jwt.decode(token, self._secret_key, algorithms=[self.algorithm])
+
+
+class ECSigner(TokenSigner):
+    """
+    ES256 signer with key rotation.
+    
+    Tokens are signed with the first private key and carry its ``kid``.
+    Every configured key, including public-only retired keys, verifies tokens.
+    """
+    
+    algorithm = "ES256"
+    
+    def __init__(self, private_keys: List[str], public_keys: List[str]):
+        """
+        Initialize the signer.
+        
+        Args:
+            private_keys: PEM private keys; the first one signs new tokens
+            public_keys: PEM public keys that only verify (retired keys)
+        
+        Raises:
+            ValueError: If no private key is given
+        """
+        if not private_keys:
+            raise ValueError("ES256 signing needs at least one key in JWT_PRIVATE_KEYS")
+        
+        self._signing_key = private_keys[0]
+        self._verification_keys: Dict[str, Dict[str, str]] = {}
+        for pem in private_keys + public_keys:
+            public_jwk = _public_jwk(pem, self.algorithm)
+            self._verification_keys[public_jwk["kid"]] = public_jwk
+        self._signing_kid = _public_jwk(self._signing_key, self.algorithm)["kid"]
+        self.cache_namespace = hashlib.sha256(
+            ",".join(sorted(self._verification_keys)).encode()
+        ).digest()
+    
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """
+        Sign claims with the active private key, setting the ``kid`` header.
+        
+        Args:
+            claims: Token claims
+        
+        Returns:
+            str: The encoded JWT token
+        """
+        return jwt.encode(
+            claims,
+            self._signing_key,
+            algorithm=self.algorithm,
+            headers={"kid": self._signing_kid},
+        )
+    
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token with the key named by its ``kid`` header.
+        
+        Args:
+            token: The encoded JWT token
+        
+        Returns:
+            Dict[str, Any]: The token claims
+        
+        Raises:
+            JWTError: If the token is invalid, expired or signed by an unknown key
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._verification_keys.get(kid)
+        if key is None:
+            raise JWTError("Unknown signing key")
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+    
+    def jwks(self) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Get every verification key as a public JWK.
+        
+        Returns:
+            Dict[str, List[Dict[str, str]]]: The key set, including retired keys
+        """
+        return {"keys": list(self._verification_keys.values())}
+
+
+def _load_pem(value: str) -> str:
+    """
+    Load a PEM key given inline or as a file path.
+    
+    Args:
+        value: PEM text or path to a PEM file
+    
+    Returns:
+        str: PEM text
+    """
+    if value.lstrip().startswith("-----BEGIN"):
+        return value
+    with open(value) as key_file:
+        return key_file.read()
+
+
+def _public_jwk(pem: str, algorithm: str) -> Dict[str, str]:
+    """
+    Build the public JWK for a key, with its RFC 7638 thumbprint as ``kid``.
+    
+    Args:
+        pem: PEM private or public key
+        algorithm: JWT algorithm name
+    
+    Returns:
+        Dict[str, str]: Public JWK
+    """
+    key = jwk.construct(pem, algorithm)
+    if key.is_public():
+        public = key.to_dict()
+    else:
+        public = key.public_key().to_dict()
+    required = {name: public[name] for name in ("crv", "kty", "x", "y")}
+    thumbprint = hashlib.sha256(
+        json.dumps(required, sort_keys=True, separators=(",", ":")).encode()
+    ).digest()
+    kid = base64.urlsafe_b64encode(thumbprint).rstrip(b"=").decode()
+    return {**required, "kid": kid, "alg": algorithm, "use": "sig"}
+
+
+@lru_cache(maxsize=4)
+def _build_token_signer(
+    algorithm: str, secret_key: str, private_keys: Tuple[str, ...], public_keys: Tuple[str, ...]
+) -> TokenSigner:
+    """
+    Build a token signer for a configuration.
+    
+    Args:
+        algorithm: JWT algorithm name
+        secret_key: Shared secret for HS256
+        private_keys: Private keys (PEM text or paths) for asymmetric algorithms
+        public_keys: Verification-only public keys (PEM text or paths)
+    
+    Returns:
+        TokenSigner: The signer
+    
+    Raises:
+        ValueError: If the algorithm is not supported
+    """
+    if algorithm == HMACSigner.algorithm:
+        return HMACSigner(secret_key)
+    if algorithm == ECSigner.algorithm:
+        return ECSigner(
+            [_load_pem(key) for key in private_keys],
+            [_load_pem(key) for key in public_keys],
+        )
+    raise ValueError(f"Unsupported JWT_ALGORITHM: {algorithm}")
+
+
+def get_token_signer() -> TokenSigner:
+    """
+    Get the token signer for the current settings.
+    
+    Returns:
+        TokenSigner: The signer
+    """
+    return _build_token_signer(
+        settings.JWT_ALGORITHM,
+        settings.SECRET_KEY,
+        tuple(settings.JWT_PRIVATE_KEYS),
+        tuple(settings.JWT_PUBLIC_KEYS),
+    )
+
+
 def create_access_token(
     subject: Union[str, Any], expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -64,9 +565,8 @@ def create_access_token(
         )
     
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm="HS256"
-    )
+    with JWT_DURATION.labels("encode").time():
+        encoded_jwt = get_token_signer().encode(to_encode)
     return encoded_jwt
 
 
@@ -92,7 +592,59 @@ def create_user_token(user_id: int, email: str, last_name: str) -> str:
         "last_name": last_name
     }
     
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm="HS256"
-    )
+    with JWT_DURATION.labels("encode").time():
+        encoded_jwt = get_token_signer().encode(to_encode)
     return encoded_jwt
+
+
+def _token_cache_key(token: str, signer: TokenSigner) -> bytes:
+    """
+    Get the token cache key for a token.
+    
+    The digest is keyed by the signer's verification keys, so rotating or
+    removing a key makes every cached entry unreachable instead of trusting it.
+    
+    Args:
+        token: The encoded JWT token
+        signer: The signer that verifies the token
+    
+    Returns:
+        bytes: 16-byte digest of the token
+    """
+    return hashlib.blake2b(
+        token.encode(), key=signer.cache_namespace, digest_size=16
+    ).digest()
+
+
+def decode_access_token(token: str) -> TokenPayload:
+    """
+    Decode and validate a JWT access token.
+    
+    Validated payloads are cached until the token expires, so a client
+    reusing its token skips signature verification and payload validation.
+    
+    Args:
+        token: The encoded JWT token
+    
+    Returns:
+        TokenPayload: The validated token payload
+    
+    Raises:
+        JWTError: If the token is invalid or expired
+        ValidationError: If the payload does not match TokenPayload
+    """
+    signer = get_token_signer()
+    cache_key = _token_cache_key(token, signer)
+    token_data = token_cache.get(cache_key)
+    if token_data is not None:
+        return token_data
+    
+    with JWT_DURATION.labels("decode").time():
+        payload = signer.decode(token)
+    token_data = TokenPayload.model_validate(payload)
+    
+    if token_data.exp is not None:
+        ttl = token_data.exp - time.time()
+        if ttl > 0:
+            token_cache.set(cache_key, token_data, ttl=ttl)
+    return token_data
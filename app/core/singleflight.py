@@ -0,0 +1,99 @@
+"""
+Request coalescing for the application.
+
+This module provides a singleflight group: concurrent calls with the same
+key share one execution and its result, instead of each doing the work.
+"""
+
+import asyncio
+import hashlib
+import secrets
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers share it.
+    
+    The shared call runs as its own task, so a caller that is cancelled
+    (e.g. its client disconnected) does not cancel it for the others.
+    Results are not cached: a call made after the shared one has finished
+    runs again.
+    
+    Attributes:
+        executed: Number of calls that ran
+        coalesced: Number of calls that shared an in-flight call
+    """
+    
+    def __init__(self):
+        """
+        Initialize the group.
+        """
+        self.executed = 0
+        self.coalesced = 0
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn, or wait for the in-flight call with the same key.
+        
+        Args:
+            key: Identifies calls that may share a result
+            fn: Coroutine function doing the work
+        
+        Returns:
+            T: The result of the shared call
+        
+        Raises:
+            Exception: Whatever the shared call raised, re-raised in every caller
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing statistics.
+        
+        Returns:
+            Dict[str, int]: Executed and coalesced call counts, and calls in flight
+        """
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+
+# Per-process key, so credential digests are useless outside this process
+_LOGIN_KEY = secrets.token_bytes(32)
+
+
+def login_flight_key(hashed_password: str, password: str) -> bytes:
+    """
+    Get the singleflight key for checking a password against a stored hash.
+    
+    Args:
+        hashed_password: The account's stored hash
+        password: The submitted password
+    
+    Returns:
+        bytes: Keyed BLAKE2b digest of both
+    """
+    digest = hashlib.blake2b(key=_LOGIN_KEY, digest_size=16)
+    digest.update(hashed_password.encode())
+    digest.update(b"\0")
+    digest.update(password.encode())
+    return digest.digest()
+
+
+# Shared by concurrent identical password checks
+login_flight = SingleFlight()
@@ -0,0 +1,56 @@
+"""
+Superuser management script.
+
+This script grants or revokes admin privileges for a registered user.
+
+Usage:
+    python -m app.create_superuser user@example.com
+    python -m app.create_superuser user@example.com --revoke
+"""
+
+import argparse
+
+from app.db.session import SessionLocal
+from app.models.user import User
+
+
+def set_superuser(email: str, is_superuser: bool = True) -> bool:
+    """
+    Set the admin flag on a registered user.
+    
+    Args:
+        email: The user's email
+        is_superuser: Whether the user should be an admin
+    
+    Returns:
+        bool: True if the user exists and was updated
+    """
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            return False
+        user.is_superuser = is_superuser
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+def main() -> None:
+    """
+    Parse arguments and update the user.
+    """
+    parser = argparse.ArgumentParser(description="Grant or revoke admin privileges")
+    parser.add_argument("email", help="Email of a registered user")
+    parser.add_argument("--revoke", action="store_true", help="Remove admin privileges")
+    args = parser.parse_args()
+    
+    if not set_superuser(args.email, not args.revoke):
+        parser.exit(1, f"No user registered with email {args.email}\n")
+    action = "revoked from" if args.revoke else "granted to"
+    print(f"Admin privileges {action} {args.email}")
+
+
+if __name__ == "__main__":
+    main()
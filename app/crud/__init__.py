@@ -0,0 +1,6 @@
+"""
+CRUD module for the application.
+
+This module contains database operations shared by the API routes. Every
+function accepts either a sync Session or an AsyncSession.
+"""
@@ -0,0 +1,175 @@
+"""
+Refresh token CRUD module.
+
+This module provides database operations for the RefreshToken model.
+"""
+
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.user import run_db
+from app.db.session import DbSession
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+def _utcnow() -> datetime:
+    """
+    Get the current time as naive UTC, as stored in refresh_tokens.
+    
+    Returns:
+        datetime: Current UTC time without tzinfo
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _issued_to(stored: RefreshToken, user: User) -> bool:
+    """
+    Check that a token was issued to this user and not to an earlier,
+    deleted account whose id the user has since been given.
+    
+    Args:
+        stored: The stored token
+        user: The user the token's user_id refers to now
+    
+    Returns:
+        bool: False if the token predates the user
+    """
+    created_at = user.created_at
+    if created_at is None:
+        return True
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    # users.created_at may be stored to the second only
+    return stored.created_at >= created_at.replace(microsecond=0)
+
+
+def hash_token(token: str) -> str:
+    """
+    Get the stored form of a refresh token.
+    
+    Tokens are 256 random bits, so a fast digest is enough; unlike a
+    password there is nothing to brute-force.
+    
+    Args:
+        token: The token handed to the client
+    
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _new_token(s: Session, user_id: int, family_id: str, now: datetime) -> str:
+    """
+    Add a new refresh token to a session (not committed).
+    
+    Args:
+        s: Database session
+        user_id: The token's user
+        family_id: The rotation family
+        now: Issue time
+    
+    Returns:
+        str: The token to hand to the client
+    """
+    token = secrets.token_urlsafe(32)
+    s.add(
+        RefreshToken(
+            user_id=user_id,
+            token_hash=hash_token(token),
+            family_id=family_id,
+            expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            created_at=now,
+        )
+    )
+    return token
+
+
+async def issue(db: DbSession, user_id: int) -> str:
+    """
+    Issue a refresh token starting a new rotation family.
+    
+    Args:
+        db: Database session
+        user_id: The token's user
+    
+    Returns:
+        str: The token to hand to the client
+    """
+    def _issue(s: Session) -> str:
+        token = _new_token(s, user_id, uuid.uuid4().hex, _utcnow())
+        s.commit()
+        return token
+    
+    return await run_db(db, _issue)
+
+
+async def rotate(db: DbSession, token: str) -> Optional[Tuple[User, str]]:
+    """
+    Exchange a refresh token for a new one in the same family.
+    
+    The old token is claimed with a conditional UPDATE, so two concurrent
+    uses cannot both succeed. Presenting a token that was already used
+    means it leaked (or the client replayed it): the whole family is revoked
+    and the user must log in again.
+    
+    Args:
+        db: Database session
+        token: The token from the client
+    
+    Returns:
+        Optional[Tuple[User, str]]: The active user and the new token, or
+        None if the token is unknown, expired, revoked, reused or older
+        than the user
+    """
+    token_hash = hash_token(token)
+    
+    def _rotate(s: Session) -> Optional[Tuple[User, str]]:
+        now = _utcnow()
+        row = s.execute(
+            select(RefreshToken, User)
+            .join(User, User.id == RefreshToken.user_id)
+            .where(RefreshToken.token_hash == token_hash)
+        ).first()
+        if row is None:
+            return None
+        stored, user = row
+        
+        claimed = s.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.id == stored.id,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(used_at=now)
+        ).rowcount
+        if not claimed:
+            if stored.revoked_at is None and stored.expires_at > now:
+                # Still valid but already used: replay, revoke the family
+                s.execute(
+                    update(RefreshToken)
+                    .where(RefreshToken.family_id == stored.family_id)
+                    .values(revoked_at=now)
+                )
+            s.commit()
+            return None
+        
+        if not user.is_active or not _issued_to(stored, user):
+            s.commit()
+            return None
+        
+        new_token = _new_token(s, user.id, stored.family_id, now)
+        s.commit()
+        return user, new_token
+    
+    return await run_db(db, _rotate)
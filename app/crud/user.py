@@ -0,0 +1,439 @@
+"""
+User CRUD module.
+
+This module provides database operations for the User model.
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Callable, Collection, Dict, List, Optional, Set, Tuple, TypeVar
+
+from sqlalchemy import and_, column, func, insert, literal_column, or_, select, table, tuple_
+from sqlalchemy import delete as sa_delete
+from sqlalchemy import update as sa_update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import user_cache
+from app.db.session import DbSession
+from app.models.refresh_token import RefreshToken
+from app.models.user import User, utcnow
+from app.schemas.user import UserCreate, UserUpdate
+
+T = TypeVar("T")
+
+# FTS5 index over users, see app.models.user.USER_FTS_DDL
+users_fts = table("users_fts", column("rowid"))
+
+# Columns safe to hand out in bulk; never includes hashed_password
+PUBLIC_COLUMNS = (
+    User.id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.phone,
+    User.is_active,
+    User.created_at,
+    User.updated_at,
+)
+
+# Ids per IN query in get_many; SQLite builds before 3.32 allow at most 999 bound parameters
+IN_CHUNK_SIZE = 500
+
+# Sort keys for list_page; each is paired with id to make the order total
+SORT_COLUMNS = {
+    "id": User.id,
+    "created_at": User.created_at,
+    "last_name": User.last_name,
+}
+
+
+async def run_db(db: DbSession, fn: Callable[[Session], T]) -> T:
+    """
+    Run a function against a session without blocking the event loop.
+    
+    Sync sessions run the function in the threadpool. Async sessions run it
+    through ``AsyncSession.run_sync``, which awaits the async driver.
+    
+    Args:
+        db: Database session
+        fn: Function taking a sync Session
+    
+    Returns:
+        T: The function result
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn)
+    return await run_in_threadpool(fn, db)
+
+
+async def get(db: DbSession, user_id: int | str) -> Optional[User]:
+    """
+    Get a user by ID.
+    
+    Args:
+        db: Database session
+        user_id: The user's ID
+    
+    Returns:
+        Optional[User]: The user, or None if not found
+    """
+    stmt = select(User).where(User.id == user_id)
+    return await run_db(db, lambda s: s.execute(stmt).scalars().first())
+
+
+async def get_many(db: DbSession, user_ids: Collection[int]) -> Dict[int, User]:
+    """
+    Get users by ID, with one IN query per IN_CHUNK_SIZE ids.
+    
+    Args:
+        db: Database session
+        user_ids: The IDs to look up
+    
+    Returns:
+        Dict[int, User]: The users found, by ID
+    """
+    ids = list(user_ids)
+    
+    def _get_many(s: Session) -> Dict[int, User]:
+        users: Dict[int, User] = {}
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            stmt = select(User).where(User.id.in_(ids[start:start + IN_CHUNK_SIZE]))
+            users.update((user.id, user) for user in s.execute(stmt).scalars())
+        return users
+    
+    if not ids:
+        return {}
+    return await run_db(db, _get_many)
+
+
+async def get_by_email(db: DbSession, email: str) -> Optional[User]:
+    """
+    Get a user by email.
+    
+    Args:
+        db: Database session
+        email: The user's email
+    
+    Returns:
+        Optional[User]: The user, or None if not found
+    """
+    stmt = select(User).where(User.email == email)
+    return await run_db(db, lambda s: s.execute(stmt).scalars().first())
+
+
+async def get_existing_emails(db: DbSession, emails: Collection[str]) -> Set[str]:
+    """
+    Get which of the given emails are already registered, in one query.
+    
+    Args:
+        db: Database session
+        emails: Emails to look up
+    
+    Returns:
+        Set[str]: The emails that already exist
+    """
+    if not emails:
+        return set()
+    stmt = select(User.email).where(User.email.in_(list(emails)))
+    return await run_db(db, lambda s: set(s.execute(stmt).scalars()))
+
+
+async def get_public_page(
+    db: DbSession,
+    *,
+    after_id: int = 0,
+    limit: int,
+    is_active: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Get the next page of users by id (keyset pagination), as plain rows.
+    
+    Uses ``WHERE id > after_id ORDER BY id LIMIT n`` on the primary key, so
+    every page costs the same however deep into the table it is.
+    
+    Args:
+        db: Database session
+        after_id: Return users with an id greater than this
+        limit: Maximum number of users
+        is_active: Only users with this active flag, if given
+        created_from: Only users created at or after this time, if given
+        created_to: Only users created before this time, if given
+    
+    Returns:
+        List[Dict[str, Any]]: Rows with the PUBLIC_COLUMNS, ordered by id
+    """
+    stmt = select(*PUBLIC_COLUMNS).where(User.id > after_id)
+    if is_active is not None:
+        stmt = stmt.where(User.is_active.is_(is_active))
+    if created_from is not None:
+        stmt = stmt.where(User.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(User.created_at < created_to)
+    stmt = stmt.order_by(User.id).limit(limit)
+    return await run_db(db, lambda s: [dict(row) for row in s.execute(stmt).mappings()])
+
+
+async def list_page(
+    db: DbSession,
+    *,
+    sort: str = "id",
+    after: Optional[Tuple[Any, int]] = None,
+    limit: int,
+) -> List[User]:
+    """
+    Get a page of users ordered by a sort key, using keyset pagination.
+    
+    The next page starts after the ``(sort value, id)`` of the last row seen,
+    which the composite indexes on ``(created_at, id)`` and ``(last_name, id)``
+    turn into an index seek: deep pages cost the same as the first one.
+    
+    The sort value is re-read from the last row by primary key when it still
+    exists, so the comparison uses the value exactly as stored; the value
+    passed in is only a fallback for rows deleted since.
+    
+    Args:
+        db: Database session
+        sort: One of SORT_COLUMNS
+        after: ``(sort value, id)`` of the last row of the previous page
+        limit: Maximum number of users
+    
+    Returns:
+        List[User]: The users, in ``(sort value, id)`` order
+    """
+    column = SORT_COLUMNS[sort]
+    stmt = select(User)
+    if after is not None:
+        after_value, after_id = after
+        if column is User.id:
+            stmt = stmt.where(User.id > after_id)
+        else:
+            stored = select(column).where(User.id == after_id).scalar_subquery()
+            stmt = stmt.where(
+                tuple_(column, User.id) > tuple_(func.coalesce(stored, after_value), after_id)
+            )
+    if column is User.id:
+        stmt = stmt.order_by(User.id)
+    else:
+        stmt = stmt.order_by(column, User.id)
+    stmt = stmt.limit(limit)
+    return await run_db(db, lambda s: list(s.execute(stmt).scalars()))
+
+
+def _search_terms(query: str) -> List[str]:
+    """
+    Split a search query into words.
+    
+    Args:
+        query: Free text from the user
+    
+    Returns:
+        List[str]: The words, without punctuation
+    """
+    return re.findall(r"\w+", query)
+
+
+async def search(db: DbSession, query: str, *, limit: int) -> List[User]:
+    """
+    Find users whose name or email contains words starting with the query words.
+    
+    On SQLite this is a ranked (bm25) prefix match against the users_fts
+    full-text index. Other databases fall back to an unranked prefix match.
+    
+    Args:
+        db: Database session
+        query: Free text, e.g. "jo smi" or "jane@exa"
+        limit: Maximum number of users
+    
+    Returns:
+        List[User]: Matching users, best match first
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return []
+    
+    def _search(s: Session) -> List[User]:
+        if s.get_bind().dialect.name == "sqlite":
+            # Quote each word so FTS5 syntax in the input is taken literally
+            match = " ".join('"{}"*'.format(term) for term in terms)
+            stmt = (
+                select(User)
+                .join(users_fts, users_fts.c.rowid == User.id)
+                .where(literal_column("users_fts").op("MATCH")(match))
+                .order_by(literal_column("users_fts.rank"))
+                .limit(limit)
+            )
+        else:
+            stmt = (
+                select(User)
+                .where(
+                    and_(
+                        *(
+                            or_(
+                                User.email.ilike(f"{term}%"),
+                                User.first_name.ilike(f"{term}%"),
+                                User.last_name.ilike(f"{term}%"),
+                            )
+                            for term in terms
+                        )
+                    )
+                )
+                .order_by(User.id)
+                .limit(limit)
+            )
+        return list(s.execute(stmt).scalars())
+    
+    return await run_db(db, _search)
+
+
+async def create(db: DbSession, user_in: UserCreate, hashed_password: str) -> User:
+    """
+    Create a user.
+    
+    Args:
+        db: Database session
+        user_in: User creation data
+        hashed_password: The already hashed password
+    
+    Returns:
+        User: The created user
+    """
+    db_user = User(
+        email=user_in.email,
+        hashed_password=hashed_password,
+        first_name=user_in.first_name,
+        last_name=user_in.last_name,
+    )
+    
+    def _create(s: Session) -> User:
+        s.add(db_user)
+        s.commit()
+        s.refresh(db_user)
+        return db_user
+    
+    return await run_db(db, _create)
+
+
+async def create_many(db: DbSession, users: List[Tuple[UserCreate, str]]) -> int:
+    """
+    Insert many users in one transaction.
+    
+    Args:
+        db: Database session
+        users: User creation data paired with the already hashed password
+    
+    Returns:
+        int: Number of users inserted
+    
+    Raises:
+        IntegrityError: If any email already exists; nothing is inserted
+    """
+    rows = [
+        {
+            "email": user_in.email,
+            "hashed_password": hashed_password,
+            "first_name": user_in.first_name,
+            "last_name": user_in.last_name,
+            "is_active": True,
+        }
+        for user_in, hashed_password in users
+    ]
+    
+    def _create_many(s: Session) -> int:
+        try:
+            s.execute(insert(User), rows)
+            s.commit()
+        except IntegrityError:
+            s.rollback()
+            raise
+        return len(rows)
+    
+    if not rows:
+        return 0
+    return await run_db(db, _create_many)
+
+
+async def update(
+    db: DbSession, user: User, user_in: UserUpdate, *, match_version: bool = False
+) -> Optional[User]:
+    """
+    Update a user's profile fields and drop the user from the user cache.
+    
+    Args:
+        db: Database session
+        user: The user to update
+        user_in: User update data; fields left as None are not changed
+        match_version: Only update if the row's updated_at still equals the
+            loaded user's, i.e. nobody changed it since it was read
+    
+    Returns:
+        Optional[User]: The updated user, or None if match_version was set
+            and the row had changed
+    """
+    def _update(s: Session) -> Optional[User]:
+        values = user_in.model_dump(include={"first_name", "last_name", "phone"}, exclude_none=True)
+        if not values:
+            return user
+        
+        statement = sa_update(User).where(User.id == user.id)
+        if match_version:
+            statement = statement.where(
+                User.updated_at.is_(None) if user.updated_at is None
+                else User.updated_at == user.updated_at
+            )
+        result = s.execute(statement.values(**values, updated_at=utcnow()))
+        if result.rowcount == 0:
+            s.rollback()
+            return None
+        
+        s.commit()
+        s.refresh(user)
+        return user
+    
+    updated = await run_db(db, _update)
+    user_cache.invalidate(user.id)
+    return updated
+
+
+async def set_password_hash(db: DbSession, user: User, hashed_password: str) -> None:
+    """
+    Replace a user's password hash, e.g. after rehashing with a newer policy.
+    
+    Args:
+        db: Database session
+        user: The user to update
+        hashed_password: The new hash
+    """
+    def _set_password_hash(s: Session) -> None:
+        user.hashed_password = hashed_password
+        s.add(user)
+        s.commit()
+    
+    await run_db(db, _set_password_hash)
+
+
+async def delete(db: DbSession, user: User) -> None:
+    """
+    Delete a user with their refresh tokens and drop the user from the user cache.
+    
+    The tokens are deleted explicitly in the same transaction rather than
+    left to the foreign key cascade: SQLite reuses the id of the newest
+    deleted user, so a surviving token would refresh into the next account.
+    
+    Args:
+        db: Database session
+        user: The user to delete
+    """
+    user_id = user.id
+    
+    def _delete(s: Session) -> None:
+        s.execute(sa_delete(RefreshToken).where(RefreshToken.user_id == user_id))
+        s.delete(user)
+        s.commit()
+    
+    await run_db(db, _delete)
+    user_cache.invalidate(user_id)
@@ -5,4 +5,5 @@ This module imports all SQLAlchemy models to ensure they are registered with the
 """
 
 from app.db.session import Base
+from app.models.refresh_token import RefreshToken  # noqa
 from app.models.user import User  # noqa
@@ -0,0 +1,302 @@
+"""
+SQL query instrumentation.
+
+This module counts the SQL statements each request runs and their time,
+logs slow statements along with the shape of their parameters (never the
+values, which may hold personal data), and provides a query budget helper
+for tests.
+
+Statements are attributed to the request whose context runs them. Sync
+sessions run on the threadpool, which copies the request's context, so
+they are counted too.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import groupby
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import DB_QUERIES_PER_REQUEST, _route_template
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """
+    Query count and time for a request or a block of code.
+    
+    Attributes:
+        count: Number of statements executed
+        duration: Total execution time in seconds
+        statements: Executed statements, if recording them
+    """
+    
+    def __init__(self, record_statements: bool = False):
+        """
+        Initialize the stats.
+        
+        Args:
+            record_statements: Keep the text of every statement
+        """
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Optional[List[str]] = [] if record_statements else None
+        self._lock = threading.Lock()
+    
+    def record(self, statement: str, elapsed: float) -> None:
+        """
+        Record one executed statement.
+        
+        Args:
+            statement: The SQL text
+            elapsed: Execution time in seconds
+        """
+        with self._lock:
+            self.count += 1
+            self.duration += elapsed
+            if self.statements is not None:
+                self.statements.append(statement)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised when a block runs more queries than its budget allows.
+    """
+
+
+# Stats of the request being handled, set by track_queries
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Stats counting every statement in the process, registered by query_budget
+_budgets: List[QueryStats] = []
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """
+    Get the query stats of the current request.
+    
+    Returns:
+        Optional[QueryStats]: The stats, or None outside track_queries
+    """
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Count the statements run in the current context.
+    
+    Yields:
+        QueryStats: Stats filled in as statements run
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Fail if a block runs more than ``max_queries`` statements.
+    
+    Meant for tests: every instrumented engine in the process is counted,
+    whichever thread runs the statement, so requests made through a test
+    client count too.
+    
+    Args:
+        max_queries: Number of statements the block may run
+    
+    Yields:
+        QueryStats: Stats filled in as statements run
+    
+    Raises:
+        QueryBudgetExceeded: If the block ran more statements than allowed
+    """
+    stats = QueryStats(record_statements=True)
+    _budgets.append(stats)
+    try:
+        yield stats
+    finally:
+        _budgets.remove(stats)
+    
+    if stats.count > max_queries:
+        listing = "\n".join(f"  {statement}" for statement in stats.statements)
+        raise QueryBudgetExceeded(
+            f"{stats.count} queries run, budget is {max_queries}:\n{listing}"
+        )
+
+
+def _value_shape(parameters: Any) -> str:
+    """
+    Describe one parameter set by the types of its values.
+    
+    Runs of the same type are collapsed, so a 500-item IN list is
+    ``(int x 500)``.
+    
+    Args:
+        parameters: A parameter dict or sequence
+    
+    Returns:
+        str: e.g. ``{email: str, id: int}`` or ``(str, int x 3)``
+    """
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(
+            f"{name}: {type(value).__name__}" for name, value in parameters.items()
+        ) + "}"
+    if parameters is None:
+        return "()"
+    runs = []
+    for type_name, group in groupby(type(value).__name__ for value in parameters):
+        size = sum(1 for _ in group)
+        runs.append(type_name if size == 1 else f"{type_name} x {size}")
+    return "(" + ", ".join(runs) + ")"
+
+
+def parameters_shape(parameters: Any, executemany: bool) -> str:
+    """
+    Describe statement parameters without their values.
+    
+    Args:
+        parameters: The statement parameters
+        executemany: Whether ``parameters`` is a list of parameter sets
+    
+    Returns:
+        str: The shape, e.g. ``(str, int)`` or ``100 x (str, int)``
+    """
+    if executemany:
+        if not parameters:
+            return "0 x ()"
+        return f"{len(parameters)} x {_value_shape(parameters[0])}"
+    return _value_shape(parameters)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """
+    Engine event handler that notes when a statement starts.
+    
+    Args:
+        conn: The SQLAlchemy connection
+        cursor: The DBAPI cursor
+        statement: The SQL text
+        parameters: The statement parameters
+        context: The execution context
+        executemany: Whether the statement runs for many parameter sets
+    """
+    conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """
+    Engine event handler that counts a statement and logs it if slow.
+    
+    Args:
+        conn: The SQLAlchemy connection
+        cursor: The DBAPI cursor
+        statement: The SQL text
+        parameters: The statement parameters
+        context: The execution context
+        executemany: Whether the statement runs for many parameter sets
+    """
+    elapsed = time.perf_counter() - conn.info["query_stats_start"].pop()
+    
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for budget in _budgets:
+        budget.record(statement, elapsed)
+    
+    slow_ms = settings.SQL_SLOW_QUERY_MS
+    if slow_ms and elapsed * 1000 >= slow_ms:
+        logger.warning(
+            "Slow query (%.1f ms): %s; parameters %s",
+            elapsed * 1000,
+            " ".join(statement.split()),
+            parameters_shape(parameters, executemany),
+        )
+
+
+def _handle_error(context) -> None:
+    """
+    Engine event handler that drops the start time of a failed statement.
+    
+    Args:
+        context: The SQLAlchemy exception context
+    """
+    connection = context.connection
+    if connection is not None and connection.info.get("query_stats_start"):
+        connection.info["query_stats_start"].pop()
+
+
+def instrument_queries(engine: Engine) -> Engine:
+    """
+    Count and time the statements an engine runs, logging slow ones.
+    
+    Instrumenting an engine twice has no further effect.
+    
+    Args:
+        engine: A sync engine (use ``AsyncEngine.sync_engine`` for async ones)
+    
+    Returns:
+        Engine: The same engine
+    """
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware counting the queries of each request.
+    
+    The count is recorded per route template in the
+    ``db_queries_per_request`` histogram, and logged with the query time
+    at debug level.
+    """
+    
+    def __init__(self, app: Callable):
+        """
+        Initialize the middleware.
+        
+        Args:
+            app: The ASGI app to wrap
+        """
+        self.app = app
+    
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        """
+        Handle an ASGI connection.
+        
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route_path = _route_template(scope)
+                DB_QUERIES_PER_REQUEST.labels(route_path).observe(stats.count)
+                logger.debug(
+                    "%s %s ran %d queries in %.1f ms",
+                    scope["method"],
+                    route_path,
+                    stats.count,
+                    stats.duration * 1000,
+                )
@@ -0,0 +1,283 @@
+"""
+Read replica routing.
+
+This module sends read-only sessions to replica databases, picked round-robin
+or by fewest sessions in use, while clients that just wrote keep reading
+from the primary so they see their own changes.
+"""
+
+import hashlib
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Sequence
+
+from fastapi import Depends, Request
+from jose.exceptions import JWTError
+from pydantic import ValidationError
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.db.session import DbSession, get_async_database_url, get_db, setup_engine
+
+READ_STRATEGIES = ("round_robin", "least_busy")
+
+
+class ReadRouter:
+    """
+    Chooses a replica for each read-only session.
+    
+    Attributes:
+        strategy: "round_robin" or "least_busy"
+        in_use: Open sessions per replica, used by least_busy
+    """
+    
+    def __init__(
+        self,
+        session_factories: Sequence[Callable[[], DbSession]],
+        strategy: str = "round_robin",
+        sticky_seconds: float = 5.0,
+        sticky_size: int = 10000,
+    ):
+        """
+        Initialize the router.
+        
+        Args:
+            session_factories: One session factory per replica
+            strategy: "round_robin" or "least_busy"
+            sticky_seconds: How long a client reads from the primary after a write
+            sticky_size: Maximum number of clients remembered as sticky
+        
+        Raises:
+            ValueError: If there are no replicas or the strategy is unknown
+        """
+        if not session_factories:
+            raise ValueError("ReadRouter needs at least one replica")
+        if strategy not in READ_STRATEGIES:
+            raise ValueError(f"Unknown read strategy {strategy!r}, expected one of {READ_STRATEGIES}")
+        self.strategy = strategy
+        self.in_use: List[int] = [0] * len(session_factories)
+        self._factories = list(session_factories)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._sticky = TTLCache(maxsize=sticky_size, ttl=sticky_seconds)
+    
+    def _choose(self) -> int:
+        """
+        Pick a replica and count the session against it.
+        
+        Returns:
+            int: The replica index
+        """
+        with self._lock:
+            if self.strategy == "least_busy":
+                index = min(range(len(self.in_use)), key=self.in_use.__getitem__)
+            else:
+                index = next(self._counter) % len(self._factories)
+            self.in_use[index] += 1
+            return index
+    
+    def _release(self, index: int) -> None:
+        """
+        Stop counting a session against a replica.
+        
+        Args:
+            index: The replica index
+        """
+        with self._lock:
+            self.in_use[index] -= 1
+    
+    @contextmanager
+    def session(self) -> Iterator[DbSession]:
+        """
+        Open a session on the next replica.
+        
+        The caller closes the session; this only tracks it while it is open.
+        
+        Yields:
+            DbSession: A session bound to a replica
+        """
+        index = self._choose()
+        try:
+            yield self._factories[index]()
+        finally:
+            self._release(index)
+    
+    def mark_write(self, client_key: str) -> None:
+        """
+        Send a client's reads to the primary for the next sticky_seconds.
+        
+        Args:
+            client_key: Key from client_key()
+        """
+        self._sticky.set(client_key, True)
+    
+    def is_sticky(self, client_key: str) -> bool:
+        """
+        Check whether a client wrote recently.
+        
+        Args:
+            client_key: Key from client_key()
+        
+        Returns:
+            bool: True if the client should read from the primary
+        """
+        return self._sticky.get(client_key, False)
+
+
+def build_read_router(urls: Sequence[str]) -> Optional[ReadRouter]:
+    """
+    Create a router with one engine per replica URL, using the current settings.
+    
+    Args:
+        urls: Replica database URLs (sync form; converted in async mode)
+    
+    Returns:
+        Optional[ReadRouter]: The router, or None if there are no replicas
+    """
+    if not urls:
+        return None
+    
+    factories: List[Callable[[], DbSession]] = []
+    for url in urls:
+        if settings.DATABASE_ASYNC:
+            async_engine = create_async_engine(get_async_database_url(url))
+            setup_engine(async_engine.sync_engine)
+            factories.append(
+                async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+            )
+        else:
+            engine = setup_engine(
+                create_engine(url, connect_args={"check_same_thread": False})
+            )
+            factories.append(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    
+    return ReadRouter(
+        factories,
+        strategy=settings.DATABASE_READ_STRATEGY,
+        sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    )
+
+
+# Router for DATABASE_READ_URLS; None sends every read to the primary
+read_router = build_read_router(settings.DATABASE_READ_URLS)
+
+
+def user_key(user_id: int) -> str:
+    """
+    Identify a user for read-your-writes stickiness.
+    
+    Args:
+        user_id: The user's id
+    
+    Returns:
+        str: An opaque key
+    """
+    return f"user:{user_id}"
+
+
+def client_key(request: Request) -> str:
+    """
+    Identify the client of a request for read-your-writes stickiness.
+    
+    A valid bearer token identifies its user, so every token and session of
+    the same user is treated alike; other requests fall back to the client
+    address.
+    
+    Args:
+        request: The incoming request
+    
+    Returns:
+        str: An opaque key
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            # Verified tokens are cached, so this rarely costs a signature check
+            return user_key(int(decode_access_token(token).sub))
+        except (JWTError, ValidationError, TypeError, ValueError):
+            pass
+    host = request.client.host if request.client else ""
+    return "ip:" + hashlib.blake2b(host.encode(), digest_size=16).hexdigest()
+
+
+def mark_user_write(user_id: int) -> None:
+    """
+    Send a user's reads to the primary for READ_YOUR_WRITES_SECONDS.
+    
+    For writes made before the client holds a token for the user, such as
+    registering, logging in or refreshing; call it once the write committed.
+    
+    Args:
+        user_id: The user whose data was written
+    """
+    if read_router is not None:
+        read_router.mark_write(user_key(user_id))
+
+
+async def get_read_db(
+    request: Request, db: DbSession = Depends(get_db)
+) -> AsyncIterator[DbSession]:
+    """
+    Get a session for read-only work.
+    
+    Uses a replica unless none are configured or the client wrote within
+    READ_YOUR_WRITES_SECONDS; then it is the primary session from get_db.
+    
+    Args:
+        request: The incoming request
+        db: Primary database session
+    
+    Yields:
+        DbSession: A replica or primary session
+    """
+    router = read_router
+    if router is None or router.is_sticky(client_key(request)):
+        yield db
+        return
+    
+    with router.session() as replica_db:
+        try:
+            yield replica_db
+        finally:
+            if isinstance(replica_db, AsyncSession):
+                await replica_db.close()
+            else:
+                replica_db.close()
+
+
+async def get_write_db(
+    request: Request, db: DbSession = Depends(get_db)
+) -> AsyncIterator[DbSession]:
+    """
+    Get the primary session for a request that modifies data.
+    
+    Each commit on the session makes the client's reads stick to the primary
+    for READ_YOUR_WRITES_SECONDS, long enough for the replicas to catch up.
+    Requests that fail before committing do not.
+    
+    Args:
+        request: The incoming request
+        db: Primary database session
+    
+    Yields:
+        DbSession: The primary session
+    """
+    router = read_router
+    if router is None:
+        yield db
+        return
+
+    def _after_commit(session) -> None:
+        router.mark_write(client_key(request))
+    
+    target = db.sync_session if isinstance(db, AsyncSession) else db
+    event.listen(target, "after_commit", _after_commit)
+    try:
+        yield db
+    finally:
+        event.remove(target, "after_commit", _after_commit)
@@ -4,25 +4,160 @@ Database session management.
 This module provides functions for creating and managing database sessions.
 """
 
-from sqlalchemy import create_engine
+import ast
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, List, Set, Union
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.instrumentation import instrument_queries
+
+# Alembic migration scripts, found relative to the package rather than the working directory
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+# Async driver for each sync URL scheme we support
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# Either kind of session can be passed to app.crud functions
+DbSession = Union[Session, AsyncSession]
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Get the async driver URL for a database URL.
+    
+    Args:
+        url: Sync database URL (e.g. sqlite:///./app.db)
+    
+    Returns:
+        str: The same URL using an async driver (e.g. sqlite+aiosqlite:///./app.db)
+    """
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme:
+        return url
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_sqlite_pragmas() -> List[str]:
+    """
+    Get the PRAGMA statements of the SQLite tuning profile.
+    
+    Returns:
+        List[str]: Statements to run on each new connection
+    """
+    return [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+    ]
+
+
+def _apply_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """
+    Engine connect event handler that applies the SQLite tuning profile.
+    
+    Args:
+        dbapi_connection: The new DBAPI connection
+        connection_record: The pool's record for the connection
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for statement in get_sqlite_pragmas():
+            cursor.execute(statement)
+    finally:
+        cursor.close()
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection: Any, connection_record: Any) -> None:
+    """
+    Engine connect event handler that enforces foreign keys, which SQLite
+    leaves off by default, so declared ON DELETE CASCADE rules run.
+    
+    Args:
+        dbapi_connection: The new DBAPI connection
+        connection_record: The pool's record for the connection
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA foreign_keys=ON")
+    finally:
+        cursor.close()
+
+
+def configure_sqlite_engine(engine: Engine) -> Engine:
+    """
+    Enforce foreign keys and apply the SQLite tuning profile to every
+    connection an engine opens.
+    
+    Does nothing for other databases; the tuning profile is skipped when
+    SQLITE_TUNING is off.
+    
+    Args:
+        engine: A sync engine (use ``AsyncEngine.sync_engine`` for async ones)
+    
+    Returns:
+        Engine: The same engine
+    """
+    if engine.dialect.name != "sqlite":
+        return engine
+    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+    if settings.SQLITE_TUNING:
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return engine
+
+
+def setup_engine(engine: Engine) -> Engine:
+    """
+    Apply the SQLite tuning profile, metrics and query instrumentation to an engine.
+    
+    Args:
+        engine: A sync engine (use ``AsyncEngine.sync_engine`` for async ones)
+    
+    Returns:
+        Engine: The same engine
+    """
+    return instrument_queries(instrument_engine(configure_sqlite_engine(engine)))
+
 
 # Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL, connect_args={"check_same_thread": False}
+engine = setup_engine(
+    create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
 )
 
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async engine and sessionmaker when async mode is enabled
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+    )
+    setup_engine(async_engine.sync_engine)
+    # expire_on_commit=False so attributes stay readable without a lazy load
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
 # Create declarative base
 Base = declarative_base()
 
 
-def get_db():
+def get_sync_db() -> Iterator[Session]:
     """
     Get a database session.
     
@@ -36,8 +171,67 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Get an async database session.
+    
+    Yields:
+        AsyncSession: A SQLAlchemy async session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency used by the routes, chosen by DATABASE_ASYNC
+get_db = get_async_db if settings.DATABASE_ASYNC else get_sync_db
+
+
 def create_tables():
     """
     Create all tables in the database.
     """
     Base.metadata.create_all(bind=engine)
+
+
+def get_migration_heads() -> Set[str]:
+    """
+    Get the head revisions of the Alembic migration scripts.
+    
+    Reads the revision identifiers from the scripts without importing them
+    (or Alembic), which keeps worker startup cheap.
+    
+    Returns:
+        Set[str]: Revisions that no other revision builds on
+    """
+    revisions: Set[str] = set()
+    parents: Set[str] = set()
+    for path in (ALEMBIC_DIR / "versions").glob("*.py"):
+        for node in ast.parse(path.read_text()).body:
+            if not isinstance(node, ast.Assign) or not isinstance(node.targets[0], ast.Name):
+                continue
+            value = ast.literal_eval(node.value)
+            if node.targets[0].id == "revision":
+                revisions.add(value)
+            elif node.targets[0].id == "down_revision" and value is not None:
+                parents.update(value if isinstance(value, (tuple, list)) else [value])
+    return revisions - parents
+
+
+def verify_migrations():
+    """
+    Check that the database has been migrated to the latest revision.
+    
+    Raises:
+        RuntimeError: If the database is not at the Alembic head revision
+    """
+    heads = get_migration_heads()
+    with engine.connect() as connection:
+        if inspect(connection).has_table("alembic_version"):
+            current = set(connection.execute(text("SELECT version_num FROM alembic_version")).scalars())
+        else:
+            current = set()
+    if current != heads:
+        raise RuntimeError(
+            f"Database is at revision {', '.join(sorted(current)) or 'none'}, "
+            f"expected {', '.join(sorted(heads))}; run `alembic upgrade head`"
+        )
@@ -1,73 +1,223 @@
 """
-Main FastAPI application instance.
+Main FastAPI application factory.
 
-This module sets up the FastAPI application with all routes and middleware.
+This module builds the FastAPI application with all routes and middleware.
+``create_app(profile)`` selects which optional parts are loaded: the "full"
+profile serves the registration page and creates missing tables, while the
+"api" profile serves the API only and refuses to start on an unmigrated
+database. Optional parts are imported only when enabled, so API workers do
+not pay for them.
 """
 
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import FastAPI, Request, Response, status
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
-from app.api.routes import auth, users
+from app.api.routes import admin, auth, users
 from app.core.config import settings
+from app.core.metrics import PrometheusMiddleware, render_metrics
 from app.core.rate_limiter import limiter
-from app.db.session import create_tables
-
-# Create FastAPI app
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    description="A simple user management API",
-    version="0.1.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    docs_url=f"{settings.API_V1_STR}/docs",
-    redoc_url=f"{settings.API_V1_STR}/redoc",
-)
-
-# Add rate limiter middleware only if not in testing mode
-if not settings.TESTING:
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-# Mount static files
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
-
-# Set up templates
-templates = Jinja2Templates(directory="app/templates")
-
-# Include routers
-app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
-app.include_router(
-    users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"]
-)
-
-
-@app.get("/")
-async def root(request: Request):
+from app.core.responses import JSONBytesResponse
+from app.core.security import PasswordHasherBusy, shutdown_password_hasher
+from app.db.instrumentation import QueryStatsMiddleware
+from app.db.session import create_tables, verify_migrations
+
+# Static files and templates, found relative to the package rather than the working directory
+APP_DIR = Path(__file__).resolve().parent
+
+# Feature toggles per profile: serve the UI, and how to treat the schema on startup
+# ("create" missing tables, or "verify" the database is at the Alembic head)
+APP_PROFILES: Dict[str, Dict[str, Any]] = {
+    "full": {"ui": True, "schema": "create"},
+    "api": {"ui": False, "schema": "verify"},
+}
+
+
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
     """
-    Root endpoint that renders the registration page.
+    Reject requests when the password hashing queue is full.
     
     Args:
         request: The incoming request
+        exc: The raised exception
+    
+    Returns:
+        JSONBytesResponse: 503 response asking the client to retry
+    """
+    return JSONBytesResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
+async def metrics() -> Response:
+    """
+    Expose service metrics in the Prometheus text format.
+    
+    Returns:
+        Response: The current metrics
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+def _mount_ui(app: FastAPI) -> None:
+    """
+    Serve the static files and the registration page.
+    
+    Args:
+        app: The application
+    """
+    from fastapi.staticfiles import StaticFiles
+    from fastapi.templating import Jinja2Templates
+    
+    app.mount("/static", StaticFiles(directory=APP_DIR / "static"), name="static")
+    templates = Jinja2Templates(directory=APP_DIR / "templates")
+    
+    @app.get("/", include_in_schema=False)
+    async def root(request: Request):
+        """
+        Root endpoint that renders the registration page.
+        
+        Args:
+            request: The incoming request
         
+        Returns:
+            TemplateResponse: The rendered registration page
+        """
+        return templates.TemplateResponse(request, "register.html")
+
+
+def _add_middleware(app: FastAPI) -> None:
+    """
+    Add the middleware enabled in the settings.
+    
+    Args:
+        app: The application
+    """
+    # Record per-route request counts and latencies
+    if settings.METRICS_ENABLED:
+        app.add_middleware(PrometheusMiddleware)
+    
+    # Count the SQL statements each request runs
+    if settings.SQL_QUERY_STATS:
+        app.add_middleware(QueryStatsMiddleware)
+    
+    # Profile sampled requests; not imported or installed at all when off
+    if settings.PROFILE_SAMPLE_RATE > 0 or settings.PROFILE_HEADER_TOKEN:
+        from app.core.profiling import ProfilingMiddleware
+        
+        app.add_middleware(
+            ProfilingMiddleware,
+            directory=settings.PROFILE_DIR,
+            sample_rate=settings.PROFILE_SAMPLE_RATE,
+            header=settings.PROFILE_HEADER,
+            header_token=settings.PROFILE_HEADER_TOKEN,
+            interval=settings.PROFILE_INTERVAL_SECONDS,
+            max_files=settings.PROFILE_MAX_FILES,
+        )
+
+
+def create_app(profile: Optional[str] = None) -> FastAPI:
+    """
+    Build the application.
+    
+    Args:
+        profile: Name of an entry in APP_PROFILES; defaults to APP_PROFILE
+    
     Returns:
-        TemplateResponse: The rendered registration page
+        FastAPI: The application
+    
+    Raises:
+        ValueError: If the profile is unknown
     """
-    return templates.TemplateResponse("register.html", {"request": request})
+    profile = profile or settings.APP_PROFILE
+    if profile not in APP_PROFILES:
+        raise ValueError(f"Unknown app profile {profile!r}; use one of {', '.join(APP_PROFILES)}")
+    features = APP_PROFILES[profile]
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        """
+        Prepare the database on startup and stop the hashing workers on shutdown.
+        
+        Args:
+            app: The application
+        """
+        if features["schema"] == "create":
+            create_tables()
+        elif features["schema"] == "verify":
+            verify_migrations()
+        yield
+        # Stop password hashing workers
+        shutdown_password_hasher()
+    
+    # Keep the default response class: routes with a response_model are
+    # then dumped to JSON bytes by pydantic-core directly.
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        description="A simple user management API",
+        version="0.1.0",
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        docs_url=f"{settings.API_V1_STR}/docs",
+        redoc_url=f"{settings.API_V1_STR}/redoc",
+        lifespan=lifespan,
+    )
+    app.state.profile = profile
+    
+    _add_middleware(app)
+    
+    # Add rate limiter middleware only if not in testing mode
+    if not settings.TESTING:
+        app.state.limiter = limiter
+        app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.add_exception_handler(PasswordHasherBusy, password_hasher_busy_handler)
+    
+    # Include routers
+    app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
+    app.include_router(
+        users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"]
+    )
+    app.include_router(
+        admin.router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"]
+    )
+    app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
+    
+    if features["ui"]:
+        _mount_ui(app)
+    
+    return app
 
 
-@app.on_event("startup")
-async def startup_event():
+def __getattr__(name: str) -> Any:
     """
-    Actions to run on application startup.
+    Build the default app on first access to ``app.main.app``.
+    
+    Importing this module for create_app does not build an app, but
+    ``uvicorn app.main:app`` and ``from app.main import app`` keep working.
+    
+    Args:
+        name: Attribute name
+    
+    Returns:
+        Any: The application for "app"
+    
+    Raises:
+        AttributeError: For any other name
     """
-    # Create database tables
-    create_tables()
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("app.main:create_app", factory=True, host="0.0.0.0", port=8000, reload=True)
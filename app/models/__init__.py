@@ -4,4 +4,5 @@ Models module for the application.
 This module contains SQLAlchemy models for database entities.
 """
 
+from app.models.refresh_token import RefreshToken
 from app.models.user import User
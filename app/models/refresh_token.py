@@ -0,0 +1,48 @@
+"""
+Refresh token model module.
+
+This module defines the SQLAlchemy model for stored refresh tokens.
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+from app.db.session import Base
+
+
+class RefreshToken(Base):
+    """
+    Refresh token, stored as a SHA-256 digest of the token handed out.
+    
+    Every rotation issues a new token in the same family; presenting a
+    token that was already rotated revokes the whole family.
+    
+    Attributes:
+        id: Unique identifier for the token
+        user_id: The user the token belongs to
+        token_hash: Hex SHA-256 digest of the token (unique)
+        family_id: Shared by a token and every token rotated from it
+        expires_at: When the token stops being accepted (UTC)
+        used_at: When the token was rotated, or None if unused (UTC)
+        revoked_at: When the token's family was revoked, or None (UTC)
+        created_at: When the token was issued (UTC)
+    """
+    
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    family_id = Column(String(32), index=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        """
+        String representation of the RefreshToken model.
+        
+        Returns:
+            str: String representation
+        """
+        return f"<RefreshToken {self.id} user={self.user_id}>"
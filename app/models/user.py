@@ -4,12 +4,28 @@ User model module.
 This module defines the SQLAlchemy model for the User entity.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
-from sqlalchemy.sql import func
+from datetime import datetime, timezone
+
+from sqlalchemy import DDL, Column, Integer, String, Boolean, DateTime, Index, event
+from sqlalchemy.sql import false, func
 
 from app.db.session import Base
 
 
+def utcnow() -> datetime:
+    """
+    Get the current time for ``updated_at``.
+    
+    Set in Python rather than by the database so the value has microsecond
+    precision on every backend (SQLite's CURRENT_TIMESTAMP has whole
+    seconds), which keeps ETags derived from it distinct across updates.
+    
+    Returns:
+        datetime: The current UTC time
+    """
+    return datetime.now(timezone.utc)
+
+
 class User(Base):
     """
     User model for storing user information.
@@ -22,11 +38,17 @@ class User(Base):
         last_name: User's last name
         phone: User's phone number (optional)
         is_active: Whether the user is active
+        is_superuser: Whether the user can use the admin endpoints
         created_at: When the user was created
         updated_at: When the user was last updated
     """
     
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination for the user listing sorts
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_last_name_id", "last_name", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -35,8 +57,9 @@ class User(Base):
     last_name = Column(String, nullable=False)
     phone = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
+    is_superuser = Column(Boolean, default=False, server_default=false(), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
     
     def __repr__(self):
         """
@@ -46,3 +69,44 @@ class User(Base):
             str: String representation
         """
         return f"<User {self.email}>"
+
+
+# Full-text index over names and emails (SQLite FTS5). It is an external
+# content table: it stores only the index and reads the text from users,
+# so triggers keep it in step with every insert, update and delete.
+USER_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        email, first_name, last_name,
+        content='users', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, email, first_name, last_name)
+        VALUES (new.id, new.email, new.first_name, new.last_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, email, first_name, last_name)
+        VALUES ('delete', old.id, old.email, old.first_name, old.last_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE OF email, first_name, last_name ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, email, first_name, last_name)
+        VALUES ('delete', old.id, old.email, old.first_name, old.last_name);
+        INSERT INTO users_fts(rowid, email, first_name, last_name)
+        VALUES (new.id, new.email, new.first_name, new.last_name);
+    END
+    """,
+)
+
+for statement in USER_FTS_DDL:
+    event.listen(User.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    User.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS users_fts").execute_if(dialect="sqlite"),
+)
@@ -4,5 +4,14 @@ Schemas module for the application.
 This module contains Pydantic schemas for request/response validation.
 """
 
-from app.schemas.token import Token, TokenPayload
-from app.schemas.user import User, UserCreate, UserInDB, UserUpdate
+from app.schemas.token import RefreshRequest, Token, TokenPayload
+from app.schemas.user import (
+    User,
+    UserBatch,
+    UserBatchRequest,
+    UserCreate,
+    UserInDB,
+    UserPage,
+    UserSnapshot,
+    UserUpdate,
+)
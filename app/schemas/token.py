@@ -16,10 +16,12 @@ class Token(BaseModel):
     Attributes:
         access_token: JWT access token
         token_type: Token type (bearer)
+        refresh_token: Opaque token for POST /auth/refresh
     """
     
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
 
 
 class TokenPayload(BaseModel):
@@ -50,3 +52,14 @@ class LoginRequest(BaseModel):
     
     username: str
     password: str = Field(..., min_length=1)
+
+
+class RefreshRequest(BaseModel):
+    """
+    Schema for refresh request.
+    
+    Attributes:
+        refresh_token: Refresh token from a previous login or refresh
+    """
+    
+    refresh_token: str = Field(..., min_length=1)
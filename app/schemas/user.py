@@ -4,9 +4,10 @@ User schemas module.
 This module defines Pydantic schemas for user-related operations.
 """
 
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 
 class UserBase(BaseModel):
@@ -34,8 +35,9 @@ class UserCreate(UserBase):
     
     password: str = Field(..., min_length=8)
     
-    @validator('password')
-    def password_strength(cls, v):
+    @field_validator('password')
+    @classmethod
+    def password_strength(cls, v: str) -> str:
         """
         Validate password strength.
         
@@ -77,15 +79,10 @@ class UserInDBBase(UserBase):
         is_active: Whether the user is active
     """
     
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     is_active: bool
-    
-    class Config:
-        """
-        Pydantic config class.
-        """
-        
-        orm_mode = True
 
 
 class User(UserInDBBase):
@@ -99,6 +96,60 @@ class User(UserInDBBase):
     phone: Optional[str] = None
 
 
+class UserPage(BaseModel):
+    """
+    Schema for one page of a user listing.
+    
+    Attributes:
+        items: The users on this page
+        next_cursor: Cursor for the next page, or None on the last page
+    """
+    
+    items: List[User]
+    next_cursor: Optional[str] = None
+
+
+class UserBatchRequest(BaseModel):
+    """
+    Schema for a batch user lookup.
+    
+    Attributes:
+        ids: User IDs to look up
+    """
+    
+    ids: List[int] = Field(..., min_length=1)
+
+
+class UserBatch(BaseModel):
+    """
+    Schema for the result of a batch user lookup.
+    
+    Attributes:
+        users: One entry per requested ID, in request order; None if not found
+        missing: Requested IDs that were not found
+    """
+    
+    users: List[Optional[User]]
+    missing: List[int]
+
+
+class UserSnapshot(User):
+    """
+    Immutable copy of a user row, safe to share between requests.
+    
+    Attributes:
+        is_superuser: Whether the user can use the admin endpoints
+        created_at: When the user was created
+        updated_at: When the user was last updated
+    """
+    
+    model_config = ConfigDict(frozen=True)
+    
+    is_superuser: bool = False
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
 class UserInDB(UserInDBBase):
     """
     Schema for user in database with hashed password.
@@ -0,0 +1,237 @@
+"""
+Production server launcher.
+
+This script runs the app under gunicorn with uvicorn workers. It sizes the
+worker count to the CPU quota of the container (cgroup v1 or v2) and the
+CPU affinity of the process, preloads the app in the master so workers
+share its memory copy-on-write, and recycles workers after a number of
+requests to bound memory growth. Everything is configured through the
+SERVER_* settings.
+
+Per-process state is made safe for several workers before the app is
+imported: metrics are aggregated through PROMETHEUS_MULTIPROC_DIR, rate
+limit counters move from process memory to a shared SQLite file, and each
+worker gets an equal share of the password hashing processes.
+
+Usage:
+    python -m app.server
+"""
+
+import logging
+import math
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# cgroup mount point inside containers
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def cgroup_cpu_limit(root: Optional[Path] = None) -> Optional[float]:
+    """
+    Read the CPU quota of the current cgroup.
+    
+    Args:
+        root: The cgroup filesystem mount point (default CGROUP_ROOT)
+    
+    Returns:
+        Optional[float]: CPUs allowed (e.g. 1.5), or None if there is no quota
+    """
+    root = root or CGROUP_ROOT
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        quota, period = (root / "cpu.max").read_text().split()
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1: quota of -1 means unlimited
+        quota = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+        if quota <= 0 or period <= 0:
+            return None
+        return quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus(root: Optional[Path] = None) -> int:
+    """
+    Count the CPUs this process may use.
+    
+    Args:
+        root: The cgroup filesystem mount point (default CGROUP_ROOT)
+    
+    Returns:
+        int: The smaller of the CPUs in the affinity mask and the cgroup
+            quota rounded up, at least 1
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit(root)
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    """
+    Get the number of worker processes to run.
+    
+    Returns:
+        int: SERVER_WORKERS, or one worker per available CPU
+    """
+    return settings.SERVER_WORKERS or available_cpus()
+
+
+def prepare_workers(workers: int) -> None:
+    """
+    Make per-process state safe to share between workers.
+    
+    Must run before the app (and prometheus_client) is imported.
+    
+    Args:
+        workers: Number of worker processes
+    """
+    cpus = available_cpus()
+    if settings.PASSWORD_HASH_WORKERS is None:
+        # Split the CPUs between the workers' hashing pools instead of giving each all of them
+        settings.PASSWORD_HASH_WORKERS = max(1, cpus // workers)
+    
+    if workers == 1:
+        return
+    
+    # Aggregate metrics over all workers; stale files from a previous run would be summed too
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir)
+    else:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+    
+    if settings.RATE_LIMIT_STORAGE_URI.startswith("memory://"):
+        path = Path(tempfile.gettempdir()) / "simple-user-ratelimit.db"
+        settings.RATE_LIMIT_STORAGE_URI = f"sqlite:///{path}"
+        logger.warning(
+            "Rate limit counters moved to %s so all %d workers share them; "
+            "set RATE_LIMIT_STORAGE_URI to choose the location", path, workers,
+        )
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    """
+    Gunicorn hook run in each new worker.
+    
+    Drops database connections inherited from the master without closing
+    them, so the worker opens its own.
+    
+    Args:
+        server: The gunicorn arbiter
+        worker: The new worker
+    """
+    from app.db import session
+    
+    session.engine.dispose(close=False)
+    if session.async_engine is not None:
+        session.async_engine.sync_engine.dispose(close=False)
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    """
+    Gunicorn hook run in the master when a worker exits.
+    
+    Args:
+        server: The gunicorn arbiter
+        worker: The exited worker
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+        
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def gunicorn_options(workers: int) -> Dict[str, Any]:
+    """
+    Build the gunicorn configuration from the settings.
+    
+    Args:
+        workers: Number of worker processes
+    
+    Returns:
+        Dict[str, Any]: gunicorn settings
+    """
+    return {
+        "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+        "workers": workers,
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        "preload_app": settings.SERVER_PRELOAD,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout": settings.SERVER_TIMEOUT_SECONDS,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "forwarded_allow_ips": settings.SERVER_FORWARDED_ALLOW_IPS,
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+    }
+
+
+def main() -> None:
+    """
+    Start the server.
+    """
+    from gunicorn.app.base import BaseApplication
+    
+    class Server(BaseApplication):
+        """
+        Gunicorn application serving app.main.create_app().
+        """
+        
+        def __init__(self, options: Dict[str, Any]):
+            """
+            Initialize the application.
+            
+            Args:
+                options: gunicorn settings
+            """
+            self.options = options
+            super().__init__()
+        
+        def load_config(self) -> None:
+            """
+            Apply the settings to the gunicorn configuration.
+            """
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+        
+        def load(self) -> Any:
+            """
+            Build the app; in the master when preloading.
+            
+            Returns:
+                Any: The ASGI app
+            """
+            from app.main import create_app
+            
+            return create_app()
+    
+    logging.basicConfig(level=logging.INFO)
+    workers = worker_count()
+    prepare_workers(workers)
+    logger.info("Starting %d workers on %s:%d", workers, settings.SERVER_HOST, settings.SERVER_PORT)
+    Server(gunicorn_options(workers)).run()
+
+
+if __name__ == "__main__":
+    main()
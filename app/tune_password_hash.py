@@ -0,0 +1,110 @@
+"""
+Password hash cost tuning script.
+
+This script times bcrypt on this host at increasing cost factors and
+recommends the highest BCRYPT_ROUNDS whose hash time stays within a target
+login latency. Run it on production hardware; costs do not transfer between
+machines.
+
+Usage:
+    python -m app.tune_password_hash
+    python -m app.tune_password_hash --target-ms 250 --samples 5
+"""
+
+import argparse
+import statistics
+import time
+from typing import Dict, Optional
+
+from passlib.hash import bcrypt
+
+# bcrypt accepts cost factors 4 to 31; beyond 16 is impractical for logins
+MIN_ROUNDS = 4
+MAX_ROUNDS = 16
+
+
+def time_rounds(rounds: int, samples: int) -> float:
+    """
+    Measure the median time of one bcrypt hash at a cost factor.
+    
+    Args:
+        rounds: bcrypt cost factor
+        samples: Number of hashes to time
+    
+    Returns:
+        float: Median seconds per hash
+    """
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("tune-password-hash")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def tune(target_seconds: float, samples: int) -> Dict[int, float]:
+    """
+    Time each cost factor until one exceeds the target.
+    
+    Each extra round doubles the work, so timing stops at the first cost
+    factor over the target.
+    
+    Args:
+        target_seconds: Highest acceptable hash time
+        samples: Hashes timed per cost factor
+    
+    Returns:
+        Dict[int, float]: Median seconds per hash for each cost factor timed
+    """
+    # Load the bcrypt backend before timing anything
+    bcrypt.using(rounds=MIN_ROUNDS).hash("warm-up")
+    
+    timings = {}
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        timings[rounds] = time_rounds(rounds, samples)
+        if timings[rounds] > target_seconds:
+            break
+    return timings
+
+
+def recommend(timings: Dict[int, float], target_seconds: float) -> Optional[int]:
+    """
+    Pick the highest cost factor within the target.
+    
+    Args:
+        timings: Median seconds per hash for each cost factor
+        target_seconds: Highest acceptable hash time
+    
+    Returns:
+        Optional[int]: The cost factor, or None if even the lowest is too slow
+    """
+    within = [rounds for rounds, seconds in timings.items() if seconds <= target_seconds]
+    return max(within, default=None)
+
+
+def main() -> None:
+    """
+    Parse arguments, time bcrypt and print the recommendation.
+    """
+    parser = argparse.ArgumentParser(description="Pick a bcrypt cost for a target login latency")
+    parser.add_argument(
+        "--target-ms", type=float, default=250.0, help="Highest acceptable hash time in milliseconds"
+    )
+    parser.add_argument("--samples", type=int, default=3, help="Hashes timed per cost factor")
+    args = parser.parse_args()
+    
+    target_seconds = args.target_ms / 1000
+    timings = tune(target_seconds, args.samples)
+    for rounds, seconds in timings.items():
+        print(f"rounds={rounds:2}  {seconds * 1000:8.1f} ms")
+    
+    rounds = recommend(timings, target_seconds)
+    if rounds is None:
+        parser.exit(1, f"Even rounds={MIN_ROUNDS} exceeds {args.target_ms:.0f} ms on this host\n")
+    print(f"\nBCRYPT_ROUNDS={rounds}")
+    print("Existing hashes move to the new cost as users log in.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Benchmarks package for the application.
+
+This package contains standalone performance benchmarks. Run them from the
+repository root, e.g. ``python -m benchmarks.token_cache``.
+"""
@@ -0,0 +1,403 @@
+"""
+HTTP load benchmark.
+
+Drives the API through register, login, /users/me GET and PUT, delete and a
+mixed workload at a set concurrency, either in-process (ASGI transport, no
+network) or against a real uvicorn worker. Reports throughput and
+p50/p95/p99 latency per scenario, can save the results as a JSON baseline,
+and flags regressions against a saved baseline.
+
+The server runs with TESTING=true (so the register rate limit does not
+reject the load) and its own temporary database.
+
+Usage:
+    python -m benchmarks.load [--target inprocess|uvicorn] [--concurrency N]
+                              [--requests N] [--scenarios a,b] [--bcrypt-rounds N]
+                              [--save-baseline FILE] [--baseline FILE] [--threshold 0.1]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+API = "/api/v1"
+PASSWORD = "load-test-password"
+SCENARIOS = ("register", "login", "me_get", "me_put", "delete", "mixed")
+
+# Share of each request type in the mixed scenario
+MIXED_WEIGHTS = {"me_get": 70, "me_put": 15, "login": 10, "register": 5}
+
+_emails = itertools.count()
+
+
+def _new_email() -> str:
+    """
+    Get an email that has not been registered in this run.
+    
+    Returns:
+        str: Unique email
+    """
+    return f"load{os.getpid()}-{next(_emails)}@example.com"
+
+
+async def _register(client: httpx.AsyncClient) -> httpx.Response:
+    """
+    Register a fresh user.
+    
+    Args:
+        client: HTTP client
+    
+    Returns:
+        httpx.Response: The register response
+    """
+    return await client.post(
+        f"{API}/auth/register",
+        json={"email": _new_email(), "first_name": "Load", "last_name": "Test", "password": PASSWORD},
+    )
+
+
+class Worker:
+    """
+    One simulated client with its own account.
+    
+    Attributes:
+        client: HTTP client
+        email: The worker's account email
+        headers: Authorization header for the account
+    """
+    
+    def __init__(self, client: httpx.AsyncClient):
+        """
+        Initialize the worker.
+        
+        Args:
+            client: HTTP client
+        """
+        self.client = client
+        self.email = ""
+        self.headers: Dict[str, str] = {}
+    
+    async def setup(self) -> None:
+        """
+        Register the worker's account (not measured).
+        """
+        self.email = _new_email()
+        response = await self.client.post(
+            f"{API}/auth/register",
+            json={"email": self.email, "first_name": "Load", "last_name": "Test", "password": PASSWORD},
+        )
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    
+    async def request(self, kind: str) -> float:
+        """
+        Make one request of a kind and time it.
+        
+        Args:
+            kind: One of SCENARIOS except "mixed"
+        
+        Returns:
+            float: Seconds taken
+        
+        Raises:
+            httpx.HTTPStatusError: If the response is an error
+        """
+        if kind == "delete":
+            # Needs a fresh account each time; only the delete is timed
+            response = await _register(self.client)
+            response.raise_for_status()
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            start = time.perf_counter()
+            response = await self.client.delete(f"{API}/users/me", headers=headers)
+        else:
+            start = time.perf_counter()
+            if kind == "register":
+                response = await _register(self.client)
+            elif kind == "login":
+                response = await self.client.post(
+                    f"{API}/auth/login", json={"username": self.email, "password": PASSWORD}
+                )
+            elif kind == "me_get":
+                response = await self.client.get(f"{API}/users/me", headers=self.headers)
+            else:
+                response = await self.client.put(
+                    f"{API}/users/me",
+                    headers=self.headers,
+                    json={"first_name": f"Load{random.randrange(1000)}"},
+                )
+        elapsed = time.perf_counter() - start
+        response.raise_for_status()
+        return elapsed
+
+
+def summarize(latencies: List[float], errors: int, wall_seconds: float) -> Dict[str, float]:
+    """
+    Compute throughput and latency percentiles.
+    
+    Args:
+        latencies: Seconds per successful request
+        errors: Number of failed requests
+        wall_seconds: Duration of the whole scenario
+    
+    Returns:
+        Dict[str, float]: requests, errors, rps and p50/p95/p99/max in milliseconds
+    """
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / wall_seconds if wall_seconds else 0.0,
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: str, concurrency: int, requests: int
+) -> Dict[str, float]:
+    """
+    Run one scenario with a number of concurrent workers.
+    
+    Args:
+        client: HTTP client
+        scenario: One of SCENARIOS
+        concurrency: Number of concurrent workers
+        requests: Total measured requests
+    
+    Returns:
+        Dict[str, float]: The scenario summary
+    """
+    workers = [Worker(client) for _ in range(concurrency)]
+    await asyncio.gather(*(worker.setup() for worker in workers))
+    
+    remaining = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+    kinds = list(MIXED_WEIGHTS)
+    weights = list(MIXED_WEIGHTS.values())
+    
+    async def drive(worker: Worker) -> None:
+        nonlocal errors
+        while next(remaining) < requests:
+            kind = random.choices(kinds, weights)[0] if scenario == "mixed" else scenario
+            try:
+                latencies.append(await worker.request(kind))
+            except httpx.HTTPError:
+                errors += 1
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(worker) for worker in workers))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def _free_port() -> int:
+    """
+    Get a free local TCP port.
+    
+    Returns:
+        int: Port number
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def inprocess_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Create a client that calls the ASGI app directly, without a network.
+    
+    Yields:
+        httpx.AsyncClient: HTTP client
+    """
+    # Settings are read at import time, so import only after the environment is set
+    from app.db.session import create_tables
+    from app.main import app
+    
+    create_tables()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        yield client
+
+
+@asynccontextmanager
+async def uvicorn_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Start one uvicorn worker in a subprocess and create a client for it.
+    
+    Yields:
+        httpx.AsyncClient: HTTP client
+    
+    Raises:
+        RuntimeError: If the server does not start
+    """
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            for _ in range(100):
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited during startup")
+                try:
+                    await client.get(f"{API}/auth/jwks")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn did not start within 10 s")
+            yield client
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+async def run(target: str, scenarios: List[str], concurrency: int, requests: int) -> Dict[str, Dict[str, float]]:
+    """
+    Run the benchmark.
+    
+    Args:
+        target: "inprocess" or "uvicorn"
+        scenarios: Scenarios to run, in order
+        concurrency: Number of concurrent workers
+        requests: Measured requests per scenario
+    
+    Returns:
+        Dict[str, Dict[str, float]]: Summary per scenario
+    """
+    make_client = inprocess_client if target == "inprocess" else uvicorn_client
+    async with make_client() as client:
+        return {
+            scenario: await run_scenario(client, scenario, concurrency, requests)
+            for scenario in scenarios
+        }
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """
+    Compare results with a baseline.
+    
+    A scenario regresses when its throughput drops, or its p95 or p99
+    latency grows, by more than the threshold.
+    
+    Args:
+        results: Summary per scenario
+        baseline: Saved summary per scenario
+        threshold: Allowed relative change (0.1 = 10%)
+    
+    Returns:
+        List[str]: One message per regression
+    """
+    regressions = []
+    for scenario, result in results.items():
+        before = baseline.get(scenario)
+        if not before:
+            continue
+        if before["rps"] and result["rps"] < before["rps"] * (1 - threshold):
+            regressions.append(
+                f"{scenario}: throughput {result['rps']:.1f}/s vs baseline {before['rps']:.1f}/s"
+            )
+        for metric in ("p95_ms", "p99_ms"):
+            if before[metric] and result[metric] > before[metric] * (1 + threshold):
+                regressions.append(
+                    f"{scenario}: {metric} {result[metric]:.1f} vs baseline {before[metric]:.1f}"
+                )
+    return regressions
+
+
+def main() -> None:
+    """
+    Parse arguments, run the benchmark, print results and check the baseline.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--bcrypt-rounds", type=int, help="Override BCRYPT_ROUNDS on the server")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Write the results here as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare against this saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative regression")
+    args = parser.parse_args()
+    
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.update(
+            {
+                "TESTING": "true",
+                "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'load.db')}",
+            }
+        )
+        if args.bcrypt_rounds:
+            os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+        results = asyncio.run(run(args.target, scenarios, args.concurrency, args.requests))
+    
+    print(f"{'scenario':10} {'req':>6} {'err':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for scenario, result in results.items():
+        print(f"{scenario:10} {result['requests']:6} {result['errors']:5} {result['rps']:9.1f} "
+              f"{result['p50_ms']:9.1f} {result['p95_ms']:9.1f} {result['p99_ms']:9.1f}")
+    
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(
+                {
+                    "meta": {
+                        "target": args.target,
+                        "concurrency": args.concurrency,
+                        "requests": args.requests,
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "cpus": os.cpu_count(),
+                    },
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nBaseline saved to {args.save_baseline}")
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Rate limit storage benchmark.
+
+Measures the cost of one rate limit check (a hit on a limit that is not
+exhausted) for the per-process memory storage and the shared SQLite storage,
+under each supported strategy.
+
+Usage:
+    python -m benchmarks.rate_limit [--iterations N]
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+from app.core import rate_limit_storage  # noqa: F401  (registers the sqlite:// storage scheme)
+
+STRATEGY_NAMES = ("fixed-window", "sliding-window-counter")
+
+
+def run(iterations: int) -> dict:
+    """
+    Run the benchmark.
+    
+    Args:
+        iterations: Number of checks per measurement
+    
+    Returns:
+        dict: Microseconds per check, keyed by (storage, strategy)
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        storages = {
+            "memory": storage_from_string("memory://"),
+            "sqlite": storage_from_string(f"sqlite:///{os.path.join(directory, 'limits.db')}"),
+        }
+        # High enough that every check is allowed and increments a counter
+        item = parse(f"{iterations * 10}/minute")
+        for storage_name, storage in storages.items():
+            for strategy_name in STRATEGY_NAMES:
+                limiter = STRATEGIES[strategy_name](storage)
+                seconds = min(
+                    timeit.repeat(
+                        lambda: limiter.hit(item, "bench", "127.0.0.1"),
+                        number=iterations,
+                        repeat=5,
+                    )
+                )
+                storage.reset()
+                results[(storage_name, strategy_name)] = seconds / iterations * 1e6
+    return results
+
+
+def main() -> None:
+    """
+    Parse arguments and print the benchmark results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    
+    for (storage_name, strategy_name), cost in run(args.iterations).items():
+        print(f"{storage_name:7} {strategy_name:24} {cost:8.2f} us/check")
+
+
+if __name__ == "__main__":
+    main()
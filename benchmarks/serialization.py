@@ -0,0 +1,150 @@
+"""
+Request validation and response serialization microbenchmark.
+
+Compares the per-request cost of the legacy path (``json.loads`` into the
+model constructor; ``jsonable_encoder`` plus ``json.dumps`` for responses)
+with the native pydantic v2 path (``model_validate_json``; a ``TypeAdapter``
+validating from ORM attributes and dumping JSON bytes in pydantic-core).
+
+Usage:
+    python -m benchmarks.serialization [--iterations N] [--page-size N]
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.models.user import User
+from app.schemas.user import User as UserSchema
+from app.schemas.user import UserCreate
+
+REGISTER_BODY = json.dumps({
+    "email": "bench@example.com",
+    "first_name": "Bench",
+    "last_name": "Mark",
+    "password": "password123",
+}).encode()
+
+
+def _dumps(content) -> bytes:
+    """
+    Encode content the way ``JSONResponse`` does.
+    
+    Args:
+        content: JSON-compatible content
+    
+    Returns:
+        bytes: Compact JSON
+    """
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _make_users(count: int) -> List[User]:
+    """
+    Build unsaved user rows.
+    
+    Args:
+        count: Number of rows
+    
+    Returns:
+        List[User]: ORM instances, as a query would return them
+    """
+    now = datetime.now(timezone.utc)
+    return [
+        User(
+            id=i,
+            email=f"user{i}@example.com",
+            hashed_password="x",
+            first_name="Bench",
+            last_name=f"User{i}",
+            phone="+15550100",
+            is_active=True,
+            is_superuser=False,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def _to_bytes(value) -> bytes:
+    """
+    Get comparable JSON for a benchmark result.
+    
+    Args:
+        value: Encoded JSON, or a validated model
+    
+    Returns:
+        bytes: JSON
+    """
+    if isinstance(value, bytes):
+        return value
+    return value.model_dump_json().encode()
+
+
+def run(iterations: int, page_size: int) -> dict:
+    """
+    Run the benchmark.
+    
+    Args:
+        iterations: Number of operations per measurement
+        page_size: Users in the list response
+    
+    Returns:
+        dict: Microseconds per operation for each case, legacy and native
+    """
+    user = _make_users(1)[0]
+    page = _make_users(page_size)
+    user_adapter = TypeAdapter(UserSchema)
+    page_adapter = TypeAdapter(List[UserSchema])
+    
+    cases = {
+        "request": (
+            lambda: UserCreate(**json.loads(REGISTER_BODY)),
+            lambda: UserCreate.model_validate_json(REGISTER_BODY),
+        ),
+        "response": (
+            lambda: _dumps(jsonable_encoder(UserSchema.model_validate(user))),
+            lambda: user_adapter.dump_json(user_adapter.validate_python(user)),
+        ),
+        "list_response": (
+            lambda: _dumps(jsonable_encoder([UserSchema.model_validate(u) for u in page])),
+            lambda: page_adapter.dump_json(page_adapter.validate_python(page)),
+        ),
+    }
+    
+    results = {}
+    for name, (legacy, native) in cases.items():
+        assert json.loads(_to_bytes(legacy())) == json.loads(_to_bytes(native()))
+        results[name] = {
+            "legacy_us": min(timeit.repeat(legacy, number=iterations, repeat=5)) / iterations * 1e6,
+            "native_us": min(timeit.repeat(native, number=iterations, repeat=5)) / iterations * 1e6,
+        }
+    return results
+
+
+def main() -> None:
+    """
+    Parse arguments and print the benchmark results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+    
+    results = run(args.iterations, args.page_size)
+    print(f"{'case':<15}{'legacy us':>12}{'native us':>12}{'speedup':>10}")
+    for name, result in results.items():
+        print(f"{name:<15}{result['legacy_us']:12.2f}{result['native_us']:12.2f}"
+              f"{result['legacy_us'] / result['native_us']:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
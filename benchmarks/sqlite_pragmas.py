@@ -0,0 +1,128 @@
+"""
+SQLite tuning profile benchmark.
+
+Compares write and read throughput on a SQLite file with the default
+settings and with the SQLITE_* tuning profile applied on connect. Writes
+commit one row per transaction from several threads at once, which is
+where the rollback journal's fsyncs and "database is locked" errors show.
+
+Usage:
+    python -m benchmarks.sqlite_pragmas [--writes N] [--reads N] [--threads N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.db.session import Base, configure_sqlite_engine
+from app.models.user import User
+
+
+def _measure(tuned: bool, writes: int, reads: int, threads: int) -> dict:
+    """
+    Run the write and read workloads against a fresh database file.
+    
+    Args:
+        tuned: Apply the tuning profile
+        writes: Total rows inserted, one per transaction
+        reads: Total primary key lookups
+        threads: Concurrent workers
+    
+    Returns:
+        dict: Writes and reads per second, and the number of lock errors
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(directory, 'bench.db')}",
+            connect_args={"check_same_thread": False},
+            pool_size=threads,
+        )
+        if tuned:
+            configure_sqlite_engine(engine)
+        Base.metadata.create_all(engine)
+        
+        errors = 0
+        
+        def write(i: int) -> None:
+            nonlocal errors
+            try:
+                with Session(engine) as s:
+                    s.execute(
+                        insert(User),
+                        {
+                            "email": f"bench{i}@example.com",
+                            "hashed_password": "x",
+                            "first_name": "Bench",
+                            "last_name": f"User{i}",
+                            "is_active": True,
+                        },
+                    )
+                    s.commit()
+            except OperationalError:
+                errors += 1
+        
+        def read(i: int) -> None:
+            with Session(engine) as s:
+                s.execute(select(User).where(User.id == i % writes + 1)).scalars().first()
+        
+        with ThreadPoolExecutor(threads) as pool:
+            start = time.perf_counter()
+            list(pool.map(write, range(writes)))
+            write_seconds = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            list(pool.map(read, range(reads)))
+            read_seconds = time.perf_counter() - start
+        
+        engine.dispose()
+    
+    return {
+        "writes_per_s": writes / write_seconds,
+        "reads_per_s": reads / read_seconds,
+        "lock_errors": errors,
+    }
+
+
+def run(writes: int, reads: int, threads: int) -> dict:
+    """
+    Run the benchmark.
+    
+    Args:
+        writes: Total rows inserted, one per transaction
+        reads: Total primary key lookups
+        threads: Concurrent workers
+    
+    Returns:
+        dict: Results for the "default" and "tuned" profiles
+    """
+    return {
+        "default": _measure(False, writes, reads, threads),
+        "tuned": _measure(True, writes, reads, threads),
+    }
+
+
+def main() -> None:
+    """
+    Parse arguments and print the benchmark results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    
+    results = run(args.writes, args.reads, args.threads)
+    for name, result in results.items():
+        print(f"{name:8} writes: {result['writes_per_s']:9.0f}/s   "
+              f"reads: {result['reads_per_s']:9.0f}/s   "
+              f"lock errors: {result['lock_errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Worker startup time and memory per app profile.
+
+Starts a fresh interpreter per run and profile, builds the app with
+``create_app(profile)``, runs its startup, and reports the time to import
+and build the app, the startup time, the total wall time including
+interpreter start, and the resident memory once ready. The database is a
+temporary SQLite file migrated to the Alembic head, so the "api" profile's
+migration check passes.
+
+Usage:
+    python -m benchmarks.startup [--runs N] [--profiles full,api]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Runs in the child process; prints one JSON line
+CHILD = """
+import asyncio, json, resource, sys, time
+started = time.perf_counter()
+from app.main import create_app
+app = create_app(sys.argv[1])
+built = time.perf_counter()
+
+async def start():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        rss_kb = None
+        try:
+            with open("/proc/self/status") as f:
+                rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+        except OSError:
+            rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(json.dumps({
+            "build_ms": (built - started) * 1000,
+            "startup_ms": (ready - built) * 1000,
+            "rss_mb": rss_kb / 1024,
+            "modules": len(sys.modules),
+        }))
+
+asyncio.run(start())
+"""
+
+
+def _migrate(database_url: str) -> None:
+    """
+    Migrate a database to the Alembic head.
+    
+    Args:
+        database_url: Sync database URL
+    """
+    from alembic import command
+    from alembic.config import Config
+    
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    config.set_main_option("sqlalchemy.url", database_url)
+    command.upgrade(config, "head")
+
+
+def measure(profile: str, env: Dict[str, str]) -> Dict[str, float]:
+    """
+    Start one worker with a profile and measure it.
+    
+    Args:
+        profile: App profile name
+        env: Environment for the child process
+    
+    Returns:
+        Dict[str, float]: build_ms, startup_ms, wall_ms, rss_mb and modules
+    """
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, profile],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["wall_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def run(profiles: List[str], runs: int) -> Dict[str, Dict[str, float]]:
+    """
+    Run the benchmark.
+    
+    Args:
+        profiles: App profile names
+        runs: Runs per profile; the median of each measurement is reported
+    
+    Returns:
+        Dict[str, Dict[str, float]]: Median measurements per profile
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{Path(tmp) / 'startup.db'}"
+        _migrate(database_url)
+        env = {**os.environ, "DATABASE_URL": database_url, "PYTHONPATH": str(ROOT)}
+        
+        results = {}
+        for profile in profiles:
+            samples = [measure(profile, env) for _ in range(runs)]
+            results[profile] = {
+                key: statistics.median(sample[key] for sample in samples) for key in samples[0]
+            }
+        return results
+
+
+def main() -> None:
+    """
+    Parse arguments and print the benchmark results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profiles", default="full,api")
+    args = parser.parse_args()
+    
+    results = run(args.profiles.split(","), args.runs)
+    print(f"{'profile':<10}{'build ms':>10}{'startup ms':>12}{'wall ms':>10}{'RSS MB':>9}{'modules':>9}")
+    for profile, result in results.items():
+        print(f"{profile:<10}{result['build_ms']:10.1f}{result['startup_ms']:12.1f}"
+              f"{result['wall_ms']:10.1f}{result['rss_mb']:9.1f}{result['modules']:9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,26 @@
 """
 Run script for the application.
 
-This script provides a convenient way to run the application.
+This script provides a convenient way to run the application: a single
+auto-reloading process for development, or the multi-worker production
+server with --production.
 """
 
+import argparse
+
 import uvicorn
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    parser = argparse.ArgumentParser(description="Run the application")
+    parser.add_argument(
+        "--production", action="store_true",
+        help="Run the multi-worker production server (configured by the SERVER_* settings)",
+    )
+    args = parser.parse_args()
+
+    if args.production:
+        from app.server import main
+        
+        main()
+    else:
+        uvicorn.run("app.main:create_app", factory=True, host="0.0.0.0", port=8000, reload=True)
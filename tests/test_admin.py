@@ -0,0 +1,288 @@
+"""
+Admin tests module.
+
+This module contains tests for the admin user endpoints.
+"""
+
+import json
+
+from app.core.cache import user_cache
+from app.core.config import settings
+from app.models.user import User
+from tests.test_auth import TestingSessionLocal, client  # Reuse the client fixture from test_auth.py
+from tests.test_users import get_user_token
+
+
+def get_admin_token(client, email_suffix=""):
+    """
+    Helper function to register a superuser and get a token.
+    
+    Args:
+        client: Test client
+        email_suffix: Suffix to make email unique
+    
+    Returns:
+        str: Bearer token for authentication
+    """
+    token = get_user_token(client, email_suffix=f"_admin{email_suffix}")
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.email == f"user_test_admin{email_suffix}@example.com").first()
+        user.is_superuser = True
+        db.commit()
+        user_cache.invalidate(user.id)
+    finally:
+        db.close()
+    return token
+
+
+def read_ndjson(response):
+    """
+    Parse an NDJSON response body.
+    
+    Args:
+        response: Test client response
+    
+    Returns:
+        list: The decoded lines
+    """
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_admin_routes_require_superuser(client):
+    """
+    Test that regular users cannot use the admin endpoints.
+    
+    Args:
+        client: Test client
+    """
+    token = get_user_token(client, email_suffix="_not_admin")
+    
+    response = client.post(
+        f"{settings.API_V1_STR}/admin/users/import?format=ndjson",
+        headers={"Authorization": token},
+        content=b"",
+    )
+    
+    assert response.status_code == 403
+
+
+def test_import_users_ndjson(client, monkeypatch):
+    """
+    Test a bulk NDJSON import with batching and per-row errors.
+    
+    Args:
+        client: Test client
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    monkeypatch.setattr(settings, "BULK_IMPORT_BATCH_SIZE", 2)
+    token = get_admin_token(client, email_suffix="_import")
+    rows = [
+        {"email": "import1@example.com", "first_name": "Im", "last_name": "One", "password": "password123"},
+        {"email": "import2@example.com", "first_name": "Im", "last_name": "Two", "password": "password123"},
+        {"email": "not-an-email", "first_name": "Bad", "last_name": "Row", "password": "password123"},
+        {"email": "import1@example.com", "first_name": "Im", "last_name": "Dup", "password": "password123"},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n{broken\n"
+    
+    response = client.post(
+        f"{settings.API_V1_STR}/admin/users/import",
+        headers={"Authorization": token, "Content-Type": "application/x-ndjson"},
+        content=body.encode(),
+    )
+    
+    assert response.status_code == 200
+    lines = read_ndjson(response)
+    errors = {line["row"]: line["error"] for line in lines if "row" in line}
+    assert set(errors) == {3, 4, 5}
+    assert "email" in errors[3]
+    assert errors[4] == "Email already registered"
+    assert {"progress": {"rows": 2, "created": 2, "failed": 0}} in lines
+    assert lines[-1] == {"summary": {"rows": 5, "created": 2, "failed": 3}}
+    
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        json={"username": "import2@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+
+
+def test_import_users_csv(client):
+    """
+    Test a bulk CSV import.
+    
+    Args:
+        client: Test client
+    """
+    token = get_admin_token(client, email_suffix="_import_csv")
+    body = (
+        "email,first_name,last_name,password\r\n"
+        "csv1@example.com,Csv,One,password123\r\n"
+        "csv2@example.com,\"Csv, Jr\",Two,short\r\n"
+        "csv3@example.com,\"Multi\nLine\",Three,password123\r\n"
+    )
+    
+    response = client.post(
+        f"{settings.API_V1_STR}/admin/users/import",
+        headers={"Authorization": token, "Content-Type": "text/csv"},
+        content=body.encode(),
+    )
+    
+    lines = read_ndjson(response)
+    assert lines[0]["row"] == 3
+    assert "password" in lines[0]["error"]
+    assert lines[-1] == {"summary": {"rows": 3, "created": 2, "failed": 1}}
+    
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "csv3@example.com").first()
+        assert user.first_name == "Multi\nLine"
+    finally:
+        db.close()
+
+
+def test_export_users_pages_and_filters(client, monkeypatch):
+    """
+    Test exporting users across several pages, with filters and without hashes.
+    
+    Args:
+        client: Test client
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    monkeypatch.setattr(settings, "EXPORT_PAGE_SIZE", 2)
+    token = get_admin_token(client, email_suffix="_export")
+    for i in range(4):
+        get_user_token(client, email_suffix=f"_export{i}")
+    db = TestingSessionLocal()
+    try:
+        db.query(User).filter(User.email == "user_test_export0@example.com").update({"is_active": False})
+        db.commit()
+    finally:
+        db.close()
+    
+    response = client.get(
+        f"{settings.API_V1_STR}/admin/users/export",
+        headers={"Authorization": token},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = read_ndjson(response)
+    ids = [row["id"] for row in rows]
+    emails = {row["email"] for row in rows}
+    assert ids == sorted(set(ids))
+    assert {f"user_test_export{i}@example.com" for i in range(4)} <= emails
+    assert all("hashed_password" not in row for row in rows)
+    
+    response = client.get(
+        f"{settings.API_V1_STR}/admin/users/export?format=csv&is_active=false",
+        headers={"Authorization": token},
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0].split(",")[:2] == ["id", "email"]
+    assert any("user_test_export0@example.com" in line for line in lines[1:])
+    assert not any("user_test_export1@example.com" in line for line in lines)
+    assert "hashed_password" not in response.text
+    
+    response = client.get(
+        f"{settings.API_V1_STR}/admin/users/export?created_from=2999-01-01T00:00:00Z",
+        headers={"Authorization": token},
+    )
+    assert response.text == ""
+
+
+def test_list_users_keyset_pagination(client):
+    """
+    Test walking the user listing with cursors under each sort key.
+    
+    Args:
+        client: Test client
+    """
+    token = get_admin_token(client, email_suffix="_list")
+    for i in range(3):
+        get_user_token(client, email_suffix=f"_list{i}")
+    
+    plain_token = get_user_token(client, email_suffix="_list_plain")
+    response = client.get(f"{settings.API_V1_STR}/users", headers={"Authorization": plain_token})
+    assert response.status_code == 403
+    
+    for sort in ("id", "created_at", "last_name"):
+        seen = []
+        cursor = None
+        while True:
+            params = {"sort": sort, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get(
+                f"{settings.API_V1_STR}/users", params=params, headers={"Authorization": token}
+            )
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page["items"]) <= 2
+            seen.extend(page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        
+        ids = [user["id"] for user in seen]
+        assert len(ids) == len(set(ids))
+        assert {f"user_test_list{i}@example.com" for i in range(3)} <= {user["email"] for user in seen}
+        assert all("hashed_password" not in user for user in seen)
+        if sort == "id":
+            assert ids == sorted(ids)
+    
+    # A cursor issued for one sort key is rejected under another
+    id_cursor = client.get(
+        f"{settings.API_V1_STR}/users", params={"limit": 1}, headers={"Authorization": token}
+    ).json()["next_cursor"]
+    response = client.get(
+        f"{settings.API_V1_STR}/users",
+        params={"sort": "last_name", "cursor": id_cursor},
+        headers={"Authorization": token},
+    )
+    assert response.status_code == 400
+
+
+def test_search_users(client):
+    """
+    Test prefix search over names and emails, kept in sync on update and delete.
+    
+    Args:
+        client: Test client
+    """
+    token = get_admin_token(client, email_suffix="_search")
+    client.post(
+        f"{settings.API_V1_STR}/auth/register",
+        json={
+            "email": "zelda.hyrule@example.com",
+            "first_name": "Zelda",
+            "last_name": "Hyrule",
+            "password": "password123",
+        },
+    )
+    
+    def search(q):
+        response = client.get(
+            f"{settings.API_V1_STR}/users/search", params={"q": q}, headers={"Authorization": token}
+        )
+        assert response.status_code == 200
+        return [user["email"] for user in response.json()]
+    
+    assert search("zel hyr") == ["zelda.hyrule@example.com"]
+    assert search("zelda.hyr") == ["zelda.hyrule@example.com"]
+    assert search('zel" (*') == ["zelda.hyrule@example.com"]  # FTS syntax is ignored
+    assert search("nobody") == []
+    
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "zelda.hyrule@example.com").first()
+        user.last_name = "Kakariko"
+        db.commit()
+        assert search("hyrule") == ["zelda.hyrule@example.com"]  # still in the email
+        assert search("zel kak") == ["zelda.hyrule@example.com"]
+        
+        db.delete(user)
+        db.commit()
+        assert search("zelda") == []
+    finally:
+        db.close()
@@ -0,0 +1,98 @@
+"""
+Async database mode tests module.
+
+This module runs the auth and user routes against an AsyncSession.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.cache import user_cache
+from app.core.config import settings
+from app.db.session import Base, get_async_database_url, get_db
+from tests.test_auth import app
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    """
+    Create a test client whose routes use an AsyncSession (aiosqlite).
+    
+    Args:
+        tmp_path: Pytest temporary directory
+    
+    Yields:
+        TestClient: A FastAPI test client
+    """
+    database_url = f"sqlite:///{tmp_path / 'async_test.db'}"
+    Base.metadata.create_all(bind=create_engine(database_url))
+    
+    # NullPool: TestClient may run each request on a different event loop
+    async_engine = create_async_engine(
+        get_async_database_url(database_url), poolclass=NullPool
+    )
+    TestingAsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+    
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+    
+    user_cache.clear()
+    previous_override = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_async_db
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides[get_db] = previous_override
+
+
+def test_get_async_database_url():
+    """
+    Test deriving async driver URLs from sync URLs.
+    """
+    assert get_async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert get_async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_user_flow_with_async_session(async_client):
+    """
+    Test register, login, read, update and delete using an AsyncSession.
+    
+    Args:
+        async_client: Test client using the async session
+    """
+    user_data = {
+        "email": "async@example.com",
+        "first_name": "Async",
+        "last_name": "User",
+        "password": "password123"
+    }
+    response = async_client.post(f"{settings.API_V1_STR}/auth/register", json=user_data)
+    assert response.status_code == 200
+    
+    response = async_client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        json={"username": "async@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    
+    response = async_client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "async@example.com"
+    
+    response = async_client.put(
+        f"{settings.API_V1_STR}/users/me", headers=headers, json={"phone": "555-0100"}
+    )
+    assert response.status_code == 200
+    assert response.json()["phone"] == "555-0100"
+    
+    response = async_client.delete(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert response.status_code == 204
+    
+    response = async_client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert response.status_code == 404
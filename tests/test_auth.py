@@ -4,20 +4,32 @@ Authentication tests module.
 This module contains tests for authentication-related functionality.
 """
 
+from datetime import datetime
+
 import pytest
 from fastapi.testclient import TestClient
+from limits.storage import MemoryStorage
+from passlib.hash import bcrypt
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.db.session import Base
-from app.main import app
+from app.core.cache import user_cache
 from app.core.config import settings
-from app.db.session import get_db
 
-# Set testing flag to True to bypass rate limiting
+# Set testing flag to True to bypass rate limiting.
+# This must happen before the app is imported, since rate limits are applied at import time.
 settings.TESTING = True
 
+from app.db.session import Base  # noqa: E402
+from app.main import app  # noqa: E402
+from app.db.session import get_db  # noqa: E402
+from app.api.routes import auth  # noqa: E402
+from app.core import rate_limiter  # noqa: E402
+from app.crud.refresh_token import hash_token  # noqa: E402
+from app.models.refresh_token import RefreshToken  # noqa: E402
+from app.models.user import User  # noqa: E402
+
 
 # Create test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -58,6 +70,9 @@ def client():
     # Create the database tables
     Base.metadata.create_all(bind=engine)
     
+    # Don't serve users cached from another test database
+    user_cache.clear()
+    
     # Create a test client
     with TestClient(app) as c:
         yield c
@@ -147,3 +162,163 @@ def test_login_user(client):
     data = response.json()
     assert "access_token" in data
     assert data["token_type"] == "bearer"
+
+
+def test_login_throttled_after_repeated_failures(client, monkeypatch):
+    """
+    Test that repeated failed logins are rejected before the password is verified.
+    
+    Args:
+        client: Test client
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    # Throttling is skipped in testing mode; enable it on a private storage
+    monkeypatch.setattr(settings, "TESTING", False)
+    monkeypatch.setattr(settings, "LOGIN_ACCOUNT_FREE_ATTEMPTS", 2)
+    monkeypatch.setattr(
+        rate_limiter,
+        "login_throttle",
+        rate_limiter.LoginThrottle(MemoryStorage(), window=60, base_delay=1, max_delay=60),
+    )
+    verify_calls = []
+    real_verify = auth.verify_and_update_password_async
+    
+    async def counting_verify(password, hashed_password):
+        verify_calls.append(password)
+        return await real_verify(password, hashed_password)
+    
+    monkeypatch.setattr(auth, "verify_and_update_password_async", counting_verify)
+    bad_login = {"username": "test@example.com", "password": "wrong-password"}
+    
+    for _ in range(3):
+        response = client.post(f"{settings.API_V1_STR}/auth/login", json=bad_login)
+        assert response.status_code == 401
+        
+    # Third failure exceeded the two free attempts: blocked without a bcrypt verify
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        json={"username": "TEST@example.com", "password": "password123"},
+    )
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert len(verify_calls) == 3
+    
+    # Testing mode bypasses the throttle, as it does the other rate limits
+    monkeypatch.setattr(settings, "TESTING", True)
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        json={"username": "test@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+
+
+def test_login_rehashes_outdated_password_hash(client):
+    """
+    Test that logging in replaces a hash made with an outdated bcrypt cost.
+    
+    Args:
+        client: Test client
+    """
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "test@example.com").first()
+        user.hashed_password = bcrypt.using(rounds=4).hash("password123")
+        db.commit()
+    finally:
+        db.close()
+    
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        json={"username": "test@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+    
+    db = TestingSessionLocal()
+    try:
+        hashed_password = db.query(User).filter(User.email == "test@example.com").first().hashed_password
+    finally:
+        db.close()
+    assert hashed_password.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+
+
+def test_refresh_token_rotation_and_reuse(client):
+    """
+    Test refreshing tokens, and that reusing a rotated token revokes its family.
+    
+    Args:
+        client: Test client
+    """
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        json={"username": "test@example.com", "password": "password123"},
+    )
+    first = response.json()["refresh_token"]
+    
+    response = client.post(f"{settings.API_V1_STR}/auth/refresh", json={"refresh_token": first})
+    assert response.status_code == 200
+    data = response.json()
+    second = data["refresh_token"]
+    assert second != first
+    response = client.get(
+        f"{settings.API_V1_STR}/users/me", headers={"Authorization": f"Bearer {data['access_token']}"}
+    )
+    assert response.json()["email"] == "test@example.com"
+    
+    # Replaying the first token fails and revokes the second as well
+    response = client.post(f"{settings.API_V1_STR}/auth/refresh", json={"refresh_token": first})
+    assert response.status_code == 401
+    response = client.post(f"{settings.API_V1_STR}/auth/refresh", json={"refresh_token": second})
+    assert response.status_code == 401
+    
+    response = client.post(f"{settings.API_V1_STR}/auth/refresh", json={"refresh_token": "unknown"})
+    assert response.status_code == 401
+
+
+def test_refresh_token_dies_with_deleted_user(client):
+    """
+    Test that a deleted user's refresh token cannot refresh into the next
+    account given the same id.
+    
+    Args:
+        client: Test client
+    """
+    def register(email):
+        response = client.post(
+            f"{settings.API_V1_STR}/auth/register",
+            json={"email": email, "first_name": "Re", "last_name": "Used", "password": "password123"},
+        )
+        assert response.status_code == 200
+        return response.json()
+    
+    alice = register("alice@example.com")
+    response = client.delete(
+        f"{settings.API_V1_STR}/users/me", headers={"Authorization": f"Bearer {alice['access_token']}"}
+    )
+    assert response.status_code == 204
+    
+    bob = register("bob@example.com")
+    response = client.get(
+        f"{settings.API_V1_STR}/users/me", headers={"Authorization": f"Bearer {bob['access_token']}"}
+    )
+    bob_id = response.json()["id"]
+    
+    response = client.post(f"{settings.API_V1_STR}/auth/refresh", json={"refresh_token": alice["refresh_token"]})
+    assert response.status_code == 401
+    
+    # A token left over from before the account existed is refused as well
+    db = TestingSessionLocal()
+    try:
+        db.add(
+            RefreshToken(
+                user_id=bob_id,
+                token_hash=hash_token("left-over"),
+                family_id="left-over",
+                expires_at=datetime(2999, 1, 1),
+                created_at=datetime(2000, 1, 1),
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+    response = client.post(f"{settings.API_V1_STR}/auth/refresh", json={"refresh_token": "left-over"})
+    assert response.status_code == 401
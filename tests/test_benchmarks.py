@@ -0,0 +1,39 @@
+"""
+Benchmark tooling tests module.
+
+This module contains tests for the load benchmark's statistics and
+regression check.
+"""
+
+from benchmarks.load import find_regressions, summarize
+
+
+def test_summarize_percentiles():
+    """
+    Test throughput and percentile computation.
+    """
+    latencies = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    
+    summary = summarize(latencies, errors=2, wall_seconds=2.0)
+    
+    assert summary["requests"] == 100
+    assert summary["errors"] == 2
+    assert summary["rps"] == 50.0
+    assert round(summary["p50_ms"]) == 50
+    assert round(summary["p95_ms"]) == 95
+    assert round(summary["p99_ms"]) == 99
+
+
+def test_find_regressions_uses_threshold():
+    """
+    Test that only changes beyond the threshold are flagged.
+    """
+    baseline = {"me_get": {"rps": 1000.0, "p95_ms": 10.0, "p99_ms": 20.0}}
+    
+    within = {"me_get": {"rps": 950.0, "p95_ms": 10.5, "p99_ms": 21.0}}
+    worse = {"me_get": {"rps": 800.0, "p95_ms": 10.0, "p99_ms": 30.0}}
+    new_scenario = {"login": {"rps": 1.0, "p95_ms": 1000.0, "p99_ms": 1000.0}}
+    
+    assert find_regressions(within, baseline, threshold=0.1) == []
+    assert len(find_regressions(worse, baseline, threshold=0.1)) == 2
+    assert find_regressions(new_scenario, baseline, threshold=0.1) == []
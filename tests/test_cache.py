@@ -0,0 +1,79 @@
+"""
+Cache tests module.
+
+This module contains tests for the TTL cache and the user cache.
+"""
+
+from app.core import cache
+from app.core.cache import TTLCache, user_cache
+from app.core.config import settings
+from tests.test_auth import client  # Reuse the client fixture from test_auth.py
+from tests.test_users import get_user_token
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """
+    Test that the cache stays within maxsize by evicting the LRU entry.
+    """
+    c = TTLCache(maxsize=2, ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1  # "b" is now least recently used
+    c.set("c", 3)
+    
+    assert c.get("b") is None
+    assert c.get("a") == 1
+    assert c.get("c") == 3
+    assert c.stats()["size"] == 2
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    """
+    Test that entries expire after their TTL.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    c = TTLCache(maxsize=10, ttl=30)
+    c.set("a", 1)
+    c.set("b", 2, ttl=5)
+    
+    now[0] += 10
+    assert c.get("a") == 1
+    assert c.get("b") is None
+    
+    now[0] += 30
+    assert c.get("a") is None
+    assert c.stats()["hits"] == 1
+    assert c.stats()["misses"] == 2
+
+
+def test_ttl_cache_disabled_with_zero_size():
+    """
+    Test that a cache with maxsize 0 never stores anything.
+    """
+    c = TTLCache(maxsize=0, ttl=60)
+    c.set("a", 1)
+    assert c.get("a") is None
+    assert len(c) == 0
+
+
+def test_read_users_me_uses_user_cache(client):
+    """
+    Test that repeated authenticated requests are served from the user cache.
+    
+    Args:
+        client: Test client
+    """
+    token = get_user_token(client, email_suffix="_cache")
+    
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers={"Authorization": token})
+    assert response.status_code == 200
+    hits = user_cache.hits
+    
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers={"Authorization": token})
+    assert response.status_code == 200
+    assert response.json()["email"] == "user_test_cache@example.com"
+    assert user_cache.hits == hits + 1
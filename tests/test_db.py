@@ -0,0 +1,191 @@
+"""
+Database engine tests module.
+
+This module contains tests for engine configuration and read replica routing.
+"""
+
+import logging
+import shutil
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import user_cache
+from app.core.config import settings
+from app.db import replicas
+from app.db.instrumentation import QueryBudgetExceeded, instrument_queries, query_budget
+from app.db.session import configure_sqlite_engine
+from app.models.user import User
+from tests.test_auth import TestingSessionLocal, client, engine  # Reuse the client fixture from test_auth.py
+from tests.test_users import get_user_token
+
+
+def test_sqlite_tuning_applied_on_connect(tmp_path, monkeypatch):
+    """
+    Test that new SQLite connections get the tuning profile.
+    
+    Args:
+        tmp_path: Pytest temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    monkeypatch.setattr(settings, "SQLITE_BUSY_TIMEOUT_MS", 1234)
+    engine = configure_sqlite_engine(create_engine(f"sqlite:///{tmp_path / 'tuned.db'}"))
+    
+    with engine.connect() as connection:
+        def pragma(name):
+            return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("cache_size") == settings.SQLITE_CACHE_SIZE
+        assert pragma("temp_store") == 2  # MEMORY
+        assert pragma("busy_timeout") == 1234
+        assert pragma("foreign_keys") == 1
+    engine.dispose()
+
+
+def test_sqlite_tuning_can_be_disabled(tmp_path, monkeypatch):
+    """
+    Test that SQLITE_TUNING=False leaves connections at SQLite's defaults.
+    
+    Args:
+        tmp_path: Pytest temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    monkeypatch.setattr(settings, "SQLITE_TUNING", False)
+    engine = configure_sqlite_engine(create_engine(f"sqlite:///{tmp_path / 'plain.db'}"))
+    
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "delete"
+        # Foreign keys are a correctness setting, not tuning
+        assert connection.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+    engine.dispose()
+
+
+def test_read_router_strategies():
+    """
+    Test round-robin and least-busy replica selection.
+    """
+    round_robin = replicas.ReadRouter([lambda: "a", lambda: "b"])
+    picked = []
+    for _ in range(3):
+        with round_robin.session() as session:
+            picked.append(session)
+    assert picked == ["a", "b", "a"]
+    
+    least_busy = replicas.ReadRouter([lambda: "a", lambda: "b"], strategy="least_busy")
+    with least_busy.session() as first:
+        with least_busy.session() as second:
+            assert (first, second) == ("a", "b")
+            assert least_busy.in_use == [1, 1]
+        with least_busy.session() as third:
+            assert third == "b"
+    assert least_busy.in_use == [0, 0]
+
+
+def test_reads_use_replica_until_client_writes(client, tmp_path, monkeypatch):
+    """
+    Test that reads go to a replica, except for a client that just wrote.
+    
+    Args:
+        client: Test client
+        tmp_path: Pytest temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    token = get_user_token(client, email_suffix="_replica")
+    other_token = get_user_token(client, email_suffix="_replica_other")
+    
+    # Snapshot the primary as a replica, then let the primary move on
+    replica_path = tmp_path / "replica.db"
+    shutil.copy(engine.url.database, replica_path)
+    replica_engine = create_engine(f"sqlite:///{replica_path}")
+    router = replicas.ReadRouter([sessionmaker(bind=replica_engine)], sticky_seconds=60)
+    monkeypatch.setattr(replicas, "read_router", router)
+    db = TestingSessionLocal()
+    try:
+        db.query(User).filter(User.email == "user_test_replica_other@example.com").update({"first_name": "Primary"})
+        db.commit()
+    finally:
+        db.close()
+    user_cache.clear()
+    
+    # Served by the replica, which has not seen the change
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers={"Authorization": other_token})
+    assert response.json()["first_name"] == "User"
+    
+    # A client that writes reads its own write from the primary
+    response = client.put(
+        f"{settings.API_V1_STR}/users/me",
+        headers={"Authorization": token},
+        json={"first_name": "Written"},
+    )
+    assert response.status_code == 200
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers={"Authorization": token})
+    assert response.json()["first_name"] == "Written"
+    
+    # A write that fails leaves the client on the replica
+    response = client.put(
+        f"{settings.API_V1_STR}/users/me",
+        headers={"Authorization": other_token, "If-Match": '"stale"'},
+        json={"first_name": "Refused"},
+    )
+    assert response.status_code == 412
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers={"Authorization": other_token})
+    assert response.json()["first_name"] == "User"
+    
+    # Registering sends no Authorization header; the new token still reads from the primary
+    new_token = get_user_token(client, email_suffix="_replica_new")
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers={"Authorization": new_token})
+    assert response.status_code == 200
+    
+    replica_engine.dispose()
+
+
+def test_query_budget_counts_request_queries(client):
+    """
+    Test that a route's queries are counted and held to a budget.
+    
+    Args:
+        client: Test client
+    """
+    instrument_queries(engine)
+    token = get_user_token(client, email_suffix="_budget")
+    headers = {"Authorization": token}
+    
+    # Authenticate (user cache miss), load the user, update it, re-read it for the response
+    with query_budget(4) as stats:
+        response = client.put(
+            f"{settings.API_V1_STR}/users/me", json={"first_name": "Budget"}, headers=headers
+        )
+    assert response.status_code == 200
+    assert stats.count == 4
+    
+    with pytest.raises(QueryBudgetExceeded, match="budget is 2"):
+        with query_budget(2):
+            client.put(f"{settings.API_V1_STR}/users/me", json={"first_name": "Over"}, headers=headers)
+
+
+def test_slow_queries_logged_with_parameter_shape(tmp_path, monkeypatch, caplog):
+    """
+    Test that slow statements are logged with parameter types, not values.
+    
+    Args:
+        tmp_path: Pytest temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+        caplog: Pytest log capture fixture
+    """
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 1e-6)
+    slow_engine = instrument_queries(create_engine(f"sqlite:///{tmp_path / 'slow.db'}"))
+    
+    with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+        with slow_engine.connect() as connection:
+            connection.execute(
+                text("SELECT :email, :a IN (:b, :c)"),
+                {"email": "secret@example.com", "a": 1, "b": 2, "c": 3},
+            )
+    slow_engine.dispose()
+    
+    assert "Slow query" in caplog.text
+    assert "parameters (str, int x 3)" in caplog.text
+    assert "secret@example.com" not in caplog.text
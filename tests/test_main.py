@@ -0,0 +1,45 @@
+"""
+App factory tests module.
+
+This module contains tests for the application profiles.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db import session
+from app.main import create_app
+
+
+def test_api_profile_serves_api_only_and_verifies_migrations(tmp_path, monkeypatch):
+    """
+    Test that the API profile has no UI and needs a migrated database.
+    
+    Args:
+        tmp_path: Pytest temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'api.db'}")
+    monkeypatch.setattr(session, "engine", engine)
+    app = create_app("api")
+    
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        with TestClient(app):
+            pass
+    
+    # Record the head revision, as `alembic upgrade head` would
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        for head in session.get_migration_heads():
+            connection.execute(text("INSERT INTO alembic_version VALUES (:v)"), {"v": head})
+    
+    with TestClient(app) as client:
+        assert client.get(f"{settings.API_V1_STR}/openapi.json").status_code == 200
+        assert client.get("/").status_code == 404
+        assert client.get("/static/").status_code == 404
+    engine.dispose()
+    
+    with pytest.raises(ValueError, match="Unknown app profile"):
+        create_app("nope")
@@ -0,0 +1,56 @@
+"""
+Metrics tests module.
+
+This module contains tests for the Prometheus metrics endpoint and hooks.
+"""
+
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.metrics import instrument_engine
+from tests.test_auth import client  # Reuse the client fixture from test_auth.py
+from tests.test_users import get_user_token
+
+
+def test_metrics_endpoint_reports_routes_and_domain_metrics(client):
+    """
+    Test that requests show up per route template, with hashing and JWT timings.
+    
+    Args:
+        client: Test client
+    """
+    token = get_user_token(client, email_suffix="_metrics")
+    client.get(f"{settings.API_V1_STR}/users/me", headers={"Authorization": token})
+    client.get("/no-such-page")
+    
+    response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/api/v1/users/me",status="200"}' in body
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"}' in body
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/api/v1/users/me"}' in body
+    assert 'password_hash_duration_seconds_count{operation="get_password_hash"}' in body
+    assert 'jwt_duration_seconds_count{operation="encode"}' in body
+
+
+def test_instrumented_engine_counts_queries_and_checkouts(tmp_path):
+    """
+    Test the SQLAlchemy query and pool hooks.
+    
+    Args:
+        tmp_path: Pytest temporary directory
+    """
+    engine = instrument_engine(create_engine(f"sqlite:///{tmp_path / 'metrics.db'}"))
+    queries = REGISTRY.get_sample_value("db_queries_total")
+    checkouts = REGISTRY.get_sample_value("db_pool_checkouts_total")
+    
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT 2"))
+    
+    assert REGISTRY.get_sample_value("db_queries_total") == queries + 2
+    assert REGISTRY.get_sample_value("db_pool_checkouts_total") == checkouts + 1
+    engine.dispose()
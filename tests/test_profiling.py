@@ -0,0 +1,69 @@
+"""
+Profiling tests module.
+
+This module contains tests for the sampled request profiling middleware.
+"""
+
+import os
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.profiling import ProfilingMiddleware
+
+
+def busy_endpoint():
+    """
+    Burn CPU for a few milliseconds so the sampler catches it.
+    
+    Returns:
+        dict: Empty response
+    """
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+    return {}
+
+
+def wait_for_samplers():
+    """
+    Wait until the sampler threads have written their profiles.
+    """
+    for thread in threading.enumerate():
+        if thread.name == "stack-sampler":
+            thread.join(timeout=5)
+
+
+def test_profiles_header_requests_with_retention(tmp_path):
+    """
+    Test that only requests with the trusted header are profiled, and old profiles are pruned.
+    
+    Args:
+        tmp_path: Pytest temporary directory
+    """
+    app = FastAPI()
+    app.get("/busy")(busy_endpoint)
+    app.add_middleware(
+        ProfilingMiddleware, directory=str(tmp_path), header_token="secret", max_files=2
+    )
+    client = TestClient(app)
+    
+    client.get("/busy")
+    client.get("/busy", headers={"X-Profile": "wrong"})
+    wait_for_samplers()
+    assert os.listdir(tmp_path) == []
+    
+    for _ in range(3):
+        client.get("/busy", headers={"X-Profile": "secret"})
+        wait_for_samplers()
+    files = sorted(os.listdir(tmp_path))
+    
+    assert len(files) == 2
+    assert all(name.endswith(".folded") and "-GET-busy-" in name for name in files)
+    with open(tmp_path / files[-1]) as f:
+        lines = f.read().splitlines()
+    assert lines
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("busy_endpoint" in line for line in lines)
@@ -0,0 +1,88 @@
+"""
+Rate limit tests module.
+
+This module contains tests for the shared rate limit storage.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from limits import parse
+from limits.errors import ConfigurationError
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+from app.core.rate_limit_storage import SQLiteStorage
+
+
+def hit_many(uri, strategy, count):
+    """
+    Hit a 10/minute limit from a separate process.
+    
+    Args:
+        uri: Storage URI
+        strategy: Strategy name
+        count: Number of hits
+    
+    Returns:
+        int: Number of hits allowed
+    """
+    limiter = STRATEGIES[strategy](storage_from_string(uri))
+    item = parse("10/minute")
+    return sum(limiter.hit(item, "shared") for _ in range(count))
+
+
+def test_sqlite_storage_is_shared_between_processes(tmp_path):
+    """
+    Test that workers in different processes count against one limit.
+    
+    Args:
+        tmp_path: Pytest temporary directory
+    """
+    for strategy in ("fixed-window", "sliding-window-counter"):
+        uri = f"sqlite:///{tmp_path / (strategy + '.db')}"
+        assert isinstance(storage_from_string(uri), SQLiteStorage)
+        
+        with ProcessPoolExecutor(4) as pool:
+            allowed = sum(pool.map(hit_many, [uri] * 4, [strategy] * 4, [5] * 4))
+        
+        assert allowed == 10
+
+
+def test_sqlite_storage_clear_and_expiry(tmp_path):
+    """
+    Test clearing a key and reading its expiry.
+    
+    Args:
+        tmp_path: Pytest temporary directory
+    """
+    storage = storage_from_string(f"sqlite:///{tmp_path / 'limits.db'}")
+    
+    assert storage.incr("key", expiry=60) == 1
+    assert storage.incr("key", expiry=60, amount=2) == 3
+    assert storage.get("key") == 3
+    assert storage.get_expiry("key") > 0
+    
+    storage.clear("key")
+    assert storage.get("key") == 0
+    assert storage.check() is True
+
+
+def test_sqlite_storage_shared_between_threads_and_needs_a_file(tmp_path):
+    """
+    Test that a thread other than the creating one sees the same counters,
+    and that in-memory URIs are refused.
+    
+    Args:
+        tmp_path: Pytest temporary directory
+    """
+    storage = storage_from_string(f"sqlite:///{tmp_path / 'threads.db'}")
+    storage.incr("key", expiry=60)
+    
+    with ThreadPoolExecutor(1) as pool:
+        assert pool.submit(storage.incr, "key", 60).result() == 2
+    assert storage.get("key") == 2
+    
+    for uri in ("sqlite://", "sqlite:///:memory:"):
+        with pytest.raises(ConfigurationError, match="memory://"):
+            storage_from_string(uri)
@@ -0,0 +1,181 @@
+"""
+Security tests module.
+
+This module contains tests for password hashing and token utilities.
+"""
+
+import asyncio
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwt
+from jose.exceptions import JWTError
+
+from app.core.config import settings
+from app.core import security
+from tests.test_auth import client  # Reuse the client fixture from test_auth.py
+
+
+def generate_es256_keys():
+    """
+    Generate a P-256 key pair.
+    
+    Returns:
+        tuple: Private key PEM and public key PEM
+    """
+    key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+
+@pytest.fixture
+def hash_pool(monkeypatch):
+    """
+    Give each test a fresh password hashing executor.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+    
+    Yields:
+        pytest.MonkeyPatch: The monkeypatch fixture, for adjusting settings
+    """
+    security.shutdown_password_hasher()
+    yield monkeypatch
+    security.shutdown_password_hasher()
+
+
+def test_async_hash_and_verify(hash_pool):
+    """
+    Test hashing and verifying a password on the process pool.
+    
+    Args:
+        hash_pool: Fresh hashing executor fixture
+    """
+    async def run():
+        hashed = await security.get_password_hash_async("password123")
+        ok = await security.verify_password_async("password123", hashed)
+        bad = await security.verify_password_async("wrong-password", hashed)
+        return hashed, ok, bad
+    
+    hashed, ok, bad = asyncio.run(run())
+    
+    assert hashed.startswith("$2b$")
+    assert ok is True
+    assert bad is False
+
+
+def test_hash_queue_full_raises_busy(hash_pool):
+    """
+    Test that hashing is rejected once the worker queue is full.
+    
+    Args:
+        hash_pool: Fresh hashing executor fixture
+    """
+    hash_pool.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    hash_pool.setattr(settings, "PASSWORD_HASH_QUEUE_SIZE", 0)
+    hash_pool.setattr(security.os, "cpu_count", lambda: 1)
+    
+    async def run():
+        return await asyncio.gather(
+            security.get_password_hash_async("password123"),
+            security.get_password_hash_async("password456"),
+            return_exceptions=True,
+        )
+    
+    results = asyncio.run(run())
+    
+    assert isinstance(results[0], str)
+    assert isinstance(results[1], security.PasswordHasherBusy)
+
+
+def test_decode_access_token_uses_token_cache():
+    """
+    Test that a decoded token is served from the token cache afterwards.
+    """
+    token = security.create_user_token(user_id=42, email="cache@example.com", last_name="Cache")
+    hits = security.token_cache.hits
+    
+    first = security.decode_access_token(token)
+    second = security.decode_access_token(token)
+    
+    assert first.sub == "42"
+    assert second is first
+    assert security.token_cache.hits == hits + 1
+
+
+def test_decode_access_token_rejects_cached_token_after_key_rotation(monkeypatch):
+    """
+    Test that rotating SECRET_KEY invalidates previously cached tokens.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    token = security.create_user_token(user_id=7, email="rotate@example.com", last_name="Rotate")
+    security.decode_access_token(token)
+    
+    monkeypatch.setattr(settings, "SECRET_KEY", "a-rotated-secret-key")
+    
+    with pytest.raises(JWTError):
+        security.decode_access_token(token)
+
+
+def test_es256_tokens_carry_kid_and_survive_rotation(monkeypatch):
+    """
+    Test ES256 signing and verifying a token signed by a retired key.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    old_private, old_public = generate_es256_keys()
+    new_private, _ = generate_es256_keys()
+    monkeypatch.setattr(settings, "JWT_ALGORITHM", "ES256")
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEYS", [old_private])
+    old_token = security.create_user_token(user_id=1, email="es@example.com", last_name="Es")
+    
+    # Rotate: sign with the new key, keep the old public key for verification
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEYS", [new_private])
+    monkeypatch.setattr(settings, "JWT_PUBLIC_KEYS", [old_public])
+    new_token = security.create_user_token(user_id=2, email="es@example.com", last_name="Es")
+    
+    assert jwt.get_unverified_header(new_token)["kid"] != jwt.get_unverified_header(old_token)["kid"]
+    assert security.decode_access_token(old_token).sub == "1"
+    assert security.decode_access_token(new_token).sub == "2"
+    
+    # Dropping the old key revokes its tokens
+    monkeypatch.setattr(settings, "JWT_PUBLIC_KEYS", [])
+    with pytest.raises(JWTError):
+        security.decode_access_token(old_token)
+
+
+def test_jwks_endpoint(client, monkeypatch):
+    """
+    Test that the JWKS endpoint publishes the ES256 public keys only.
+    
+    Args:
+        client: Test client
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    response = client.get(f"{settings.API_V1_STR}/auth/jwks")
+    assert response.status_code == 200
+    assert response.json() == {"keys": []}
+    
+    private_pem, public_pem = generate_es256_keys()
+    monkeypatch.setattr(settings, "JWT_ALGORITHM", "ES256")
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEYS", [private_pem])
+    
+    response = client.get(f"{settings.API_V1_STR}/auth/jwks")
+    keys = response.json()["keys"]
+    token = security.create_user_token(user_id=3, email="jwks@example.com", last_name="Jwks")
+    
+    assert len(keys) == 1
+    assert keys[0]["kid"] == jwt.get_unverified_header(token)["kid"]
+    assert "d" not in keys[0]
+    assert jwt.decode(token, keys[0], algorithms=["ES256"])["sub"] == "3"
@@ -0,0 +1,71 @@
+"""
+Production server launcher tests module.
+
+This module contains tests for worker sizing and multi-worker preparation.
+"""
+
+import os
+
+import pytest
+
+from app import server
+from app.core.config import settings
+
+
+@pytest.mark.parametrize(
+    "files, expected",
+    [
+        ({"cpu.max": "150000 100000\n"}, 1.5),
+        ({"cpu.max": "max 100000\n"}, None),
+        ({"cpu/cpu.cfs_quota_us": "200000\n", "cpu/cpu.cfs_period_us": "100000\n"}, 2.0),
+        ({"cpu/cpu.cfs_quota_us": "-1\n", "cpu/cpu.cfs_period_us": "100000\n"}, None),
+        ({}, None),
+    ],
+)
+def test_cgroup_cpu_limit(tmp_path, files, expected):
+    """
+    Test reading cgroup v2 and v1 CPU quotas.
+    
+    Args:
+        tmp_path: Pytest temporary directory
+        files: cgroup files to create, relative to the mount point
+        expected: Expected CPU limit
+    """
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    
+    assert server.cgroup_cpu_limit(tmp_path) == expected
+
+
+def test_workers_sized_to_quota_and_state_shared(tmp_path, monkeypatch):
+    """
+    Test worker sizing and the per-process state moved out of memory.
+    
+    Args:
+        tmp_path: Pytest temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    (tmp_path / "cpu.max").write_text("250000 100000\n")
+    monkeypatch.setattr(server, "CGROUP_ROOT", tmp_path)
+    monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: set(range(8)), raising=False)
+    monkeypatch.setattr(settings, "SERVER_WORKERS", None)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", None)
+    monkeypatch.setattr(settings, "RATE_LIMIT_STORAGE_URI", "memory://")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path / "metrics"))
+    (tmp_path / "metrics").mkdir()
+    (tmp_path / "metrics" / "counter_1.db").write_text("stale")
+    
+    workers = server.worker_count()
+    server.prepare_workers(workers)
+    options = server.gunicorn_options(workers)
+    
+    assert workers == 3
+    assert settings.PASSWORD_HASH_WORKERS == 1
+    assert settings.RATE_LIMIT_STORAGE_URI.startswith("sqlite:///")
+    assert os.listdir(tmp_path / "metrics") == []
+    assert options["workers"] == 3
+    assert options["worker_class"] == "uvicorn_worker.UvicornWorker"
+    assert options["preload_app"] is settings.SERVER_PRELOAD
+    assert options["max_requests"] == settings.SERVER_MAX_REQUESTS
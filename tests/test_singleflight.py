@@ -0,0 +1,78 @@
+"""
+Singleflight tests module.
+
+This module contains tests for request coalescing.
+"""
+
+import asyncio
+
+from app.core.singleflight import SingleFlight, login_flight_key
+
+
+def test_concurrent_calls_share_one_execution():
+    """
+    Test that concurrent calls with one key run once and share the result.
+    """
+    flight = SingleFlight()
+    runs = []
+    
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+    
+    async def run():
+        same = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        other = await flight.do("other", work)
+        again = await flight.do("key", work)
+        return same, other, again
+    
+    same, other, again = asyncio.run(run())
+    
+    assert same == ["result"] * 5
+    assert len(runs) == 3
+    assert flight.stats() == {"executed": 3, "coalesced": 4, "in_flight": 0}
+
+
+def test_shared_call_survives_caller_cancellation_and_shares_errors():
+    """
+    Test that cancelling the first caller does not cancel the shared call,
+    and that an error reaches every caller.
+    """
+    flight = SingleFlight()
+    
+    async def slow():
+        await asyncio.sleep(0.02)
+        return 42
+    
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+    
+    async def run():
+        first = asyncio.ensure_future(flight.do("slow", slow))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do("slow", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        
+        errors = await asyncio.gather(
+            flight.do("fail", failing), flight.do("fail", failing), return_exceptions=True
+        )
+        return await second, errors
+    
+    result, errors = asyncio.run(run())
+    
+    assert result == 42
+    assert [type(error) for error in errors] == [ValueError, ValueError]
+
+
+def test_login_flight_key_depends_on_hash_and_password():
+    """
+    Test that the login key changes with either the stored hash or the password.
+    """
+    key = login_flight_key("$2b$12$hash-a", "password123")
+    
+    assert key == login_flight_key("$2b$12$hash-a", "password123")
+    assert key != login_flight_key("$2b$12$hash-a", "password124")
+    assert key != login_flight_key("$2b$12$hash-b", "password123")
@@ -7,8 +7,11 @@ This module contains tests for user-related functionality.
 import pytest
 from fastapi.testclient import TestClient
 
+from app.core.cache import user_cache
 from app.core.config import settings
-from tests.test_auth import client  # Reuse the client fixture from test_auth.py
+from app.crud import user as crud_user
+from app.db.instrumentation import instrument_queries, query_budget
+from tests.test_auth import client, engine  # Reuse the client fixture from test_auth.py
 
 
 def get_user_token(client, email_suffix=""):
@@ -145,3 +148,89 @@ def test_delete_user_me(client):
     
     # Check response (should be unauthorized or not found)
     assert response.status_code in [401, 403, 404]
+
+
+def test_etag_conditional_get_and_update(client):
+    """
+    Test If-None-Match on GET /users/me and If-Match on PUT /users/me.
+    
+    Args:
+        client: Test client
+    """
+    instrument_queries(engine)
+    headers = {"Authorization": get_user_token(client, email_suffix="_etag")}
+    url = f"{settings.API_V1_STR}/users/me"
+    
+    response = client.get(url, headers=headers)
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert etag.startswith('"')
+    
+    # Unchanged: 304 with no body, answered from the user cache
+    with query_budget(0):
+        response = client.get(url, headers={**headers, "If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    
+    # A matching If-Match updates and returns the new tag
+    response = client.put(url, json={"first_name": "Tagged"}, headers={**headers, "If-Match": etag})
+    new_etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert new_etag != etag
+    assert client.get(url, headers=headers).headers["etag"] == new_etag
+    assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 200
+    
+    # A stale If-Match is rejected and changes nothing
+    response = client.put(url, json={"first_name": "Lost"}, headers={**headers, "If-Match": etag})
+    assert response.status_code == 412
+    assert client.get(url, headers=headers).json()["first_name"] == "Tagged"
+
+
+def test_batch_lookup_in_request_order(client, monkeypatch):
+    """
+    Test the service batch lookup: order, missing ids, cache and limits.
+    
+    Args:
+        client: Test client
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    monkeypatch.setattr(settings, "SERVICE_API_KEYS", ["old-key", "service-key"])
+    monkeypatch.setattr(settings, "USER_BATCH_MAX_IDS", 5)
+    instrument_queries(engine)
+    url = f"{settings.API_V1_STR}/users/batch"
+    service = {"X-Service-Key": "service-key"}
+    
+    ids = []
+    for suffix in ("_batch1", "_batch2"):
+        token = get_user_token(client, email_suffix=suffix)
+        ids.append(client.get(f"{settings.API_V1_STR}/users/me", headers={"Authorization": token}).json()["id"])
+    missing_id = max(ids) + 1000
+    
+    # Both users are cached by the /me calls; only the missing id needs the database
+    with query_budget(1):
+        response = client.post(url, json={"ids": [ids[1], missing_id, ids[0], ids[1]]}, headers=service)
+    data = response.json()
+    assert response.status_code == 200
+    assert [user and user["id"] for user in data["users"]] == [ids[1], None, ids[0], ids[1]]
+    assert data["users"][0]["email"] == "user_test_batch2@example.com"
+    assert "is_superuser" not in data["users"][0]
+    assert data["missing"] == [missing_id]
+    
+    # Uncached users come from one IN query
+    user_cache.clear()
+    with query_budget(1):
+        response = client.get(url, params={"ids": [ids[0], ids[1]]}, headers=service)
+    assert [user["id"] for user in response.json()["users"]] == ids
+    
+    # Long id lists are split into several IN queries
+    monkeypatch.setattr(crud_user, "IN_CHUNK_SIZE", 1)
+    user_cache.clear()
+    with query_budget(2) as stats:
+        response = client.post(url, json={"ids": ids}, headers=service)
+    assert stats.count == 2
+    assert [user["id"] for user in response.json()["users"]] == ids
+    
+    assert client.post(url, json={"ids": ids}).status_code == 401
+    assert client.post(url, json={"ids": ids}, headers={"X-Service-Key": "wrong"}).status_code == 401
+    assert client.post(url, json={"ids": list(range(6))}, headers=service).status_code == 422